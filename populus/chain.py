@@ -35,7 +35,9 @@ from populus.utils.module_loading import (
     import_string,
 )
 from populus.utils.wait import (
+    POLL_INTERVAL_SAMPLE_SIZE,
     Wait,
+    get_poll_interval,
 )
 from populus.utils.filesystem import (
     remove_file_if_exists,
@@ -166,6 +168,7 @@ class Chain(object):
     project = None
     chain_name = None
     _factory_cache = None
+    _poll_interval = None
 
     def __init__(self, project, chain_name):
         self.project = project
@@ -183,6 +186,23 @@ class Chain(object):
     def wait(self):
         return Wait(self.web3)
 
+    def get_poll_interval(self):
+        """
+        Returns the interval at which to poll the chain for transaction
+        receipts, derived from its average block time.  Once the chain has
+        produced enough blocks for a full sample the interval is reused,
+        until then it is measured from the blocks available each time.
+        """
+        if self._poll_interval is None:
+            poll_interval = get_poll_interval(
+                self.web3,
+                min_sample_size=POLL_INTERVAL_SAMPLE_SIZE,
+            )
+            if poll_interval is None:
+                return get_poll_interval(self.web3)
+            self._poll_interval = poll_interval
+        return self._poll_interval
+
     @property
     def chain_config(self):
         raise NotImplementedError("Must be implemented by subclasses")
@@ -1,13 +1,24 @@
 import os
+import glob
+import gzip
 import json
+import hashlib
+
+from web3.utils.string import (
+    force_bytes,
+    force_text,
+)
 
 from populus.utils.filesystem import (
+    ensure_path_exists,
     get_contracts_dir,
     get_compiled_contracts_file_path,
+    get_compiled_contracts_cache_file_path,
     recursive_find_files,
 )
 from solc import (
     compile_files,
+    get_solc_version_string,
 )
 from solc.exceptions import (
     ContractsNotFound,
@@ -46,6 +57,95 @@ def compile_project_contracts(project_dir, **compiler_kwargs):
     return contract_source_paths, compiled_sources
 
 
+def get_contract_source_hash(project_dir, contract_source_paths, **compiler_kwargs):
+    """
+    Returns a sha256 hex digest identifying the result of compiling the
+    `contract_source_paths` with the given compiler arguments.  The digest
+    covers the path and contents of each source file, the compiler arguments
+    and the version of the `solc` compiler.
+    """
+    contracts_dir = get_contracts_dir(project_dir)
+    source_hash = hashlib.sha256()
+
+    source_hash.update(force_bytes(get_solc_version_string()))
+    source_hash.update(force_bytes(json.dumps(compiler_kwargs, sort_keys=True)))
+
+    for source_path in sorted(contract_source_paths):
+        source_hash.update(force_bytes(os.path.relpath(source_path, contracts_dir)))
+        with open(source_path, 'rb') as source_file:
+            source_hash.update(hashlib.sha256(source_file.read()).digest())
+
+    return source_hash.hexdigest()
+
+
+def read_cached_compiled_sources(cache_file_path):
+    try:
+        with gzip.open(cache_file_path, 'rb') as cache_file:
+            return json.loads(force_text(cache_file.read()))
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def write_cached_compiled_sources(cache_file_path, compiled_sources):
+    ensure_path_exists(os.path.dirname(cache_file_path))
+
+    # Write to a temporary file first so that a concurrent reader never sees
+    # a partially written cache file.
+    temp_file_path = "{0}.{1}.tmp".format(cache_file_path, os.getpid())
+    with gzip.open(temp_file_path, 'wb') as cache_file:
+        cache_file.write(force_bytes(json.dumps(compiled_sources, sort_keys=True)))
+    os.rename(temp_file_path, cache_file_path)
+
+
+def prune_cached_compiled_sources(project_dir, cache_file_path):
+    """
+    Removes every compiled contracts cache file other than `cache_file_path`
+    so that stale entries do not accumulate as the sources are edited.
+    """
+    stale_cache_file_paths = glob.glob(
+        get_compiled_contracts_cache_file_path(project_dir, '*'),
+    )
+    for stale_cache_file_path in stale_cache_file_paths:
+        if os.path.abspath(stale_cache_file_path) == os.path.abspath(cache_file_path):
+            continue
+        try:
+            os.remove(stale_cache_file_path)
+        except OSError:
+            # Another process may have already removed it.
+            pass
+
+
+def compile_project_contracts_with_cache(project_dir, **compiler_kwargs):
+    """
+    Same as `compile_project_contracts` but the compiled contracts are cached
+    on disk under the project's build directory, keyed by the hash of the
+    contract sources, so that unchanged sources are only compiled once.
+    """
+    compiler_kwargs.setdefault('output_values', ['bin', 'bin-runtime', 'abi'])
+    contract_source_paths = find_project_contracts(project_dir)
+
+    if not contract_source_paths:
+        return compile_project_contracts(project_dir, **compiler_kwargs)
+
+    source_hash = get_contract_source_hash(
+        project_dir,
+        contract_source_paths,
+        **compiler_kwargs
+    )
+    cache_file_path = get_compiled_contracts_cache_file_path(project_dir, source_hash)
+
+    compiled_sources = read_cached_compiled_sources(cache_file_path)
+    if compiled_sources is None:
+        contract_source_paths, compiled_sources = compile_project_contracts(
+            project_dir,
+            **compiler_kwargs
+        )
+        write_cached_compiled_sources(cache_file_path, compiled_sources)
+        prune_cached_compiled_sources(project_dir, cache_file_path)
+
+    return contract_source_paths, compiled_sources
+
+
 def compile_and_write_contracts(project_dir, **compiler_kwargs):
     contract_source_paths, compiled_sources = compile_project_contracts(
         project_dir,
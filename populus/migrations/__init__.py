@@ -3,6 +3,7 @@ from .migration import (  # noqa
 )
 from .operations import (  # noqa
     Operation,
+    TransactionOperation,
     RunPython,
     SendTransaction,
     DeployContract,
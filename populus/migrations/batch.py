@@ -0,0 +1,626 @@
+import collections
+
+import gevent
+
+from toposort import toposort
+
+from web3.formatters import (
+    input_transaction_formatter,
+)
+from web3.utils.encoding import (
+    to_decimal,
+)
+from web3.utils.formatting import (
+    add_0x_prefix,
+)
+from web3.utils.transactions import (
+    get_block_gas_limit,
+)
+from web3.utils.string import (
+    force_text,
+)
+from web3.utils.types import (
+    is_string,
+)
+
+from populus.utils.contracts import (
+    get_contract_library_dependencies,
+)
+from populus.utils.rpc import (
+    make_batch_request,
+    make_batch_request_with_errors,
+)
+from populus.utils.types import (
+    is_hex_address,
+)
+
+from .deferred import (
+    DeferredValue,
+    RegistrarValue,
+)
+from .operations import (
+    TransactionOperation,
+    SendTransaction,
+    DeployContract,
+    TransactContract,
+)
+
+
+DEFAULT_GAS_BUFFER = 100000
+DEFAULT_GAS = 90000
+
+
+def fill_transaction_gas(web3, transactions, gas_buffer=DEFAULT_GAS_BUFFER):
+    """
+    Sets the `gas` value on any of the (formatted) `transactions` which do not
+    specify one, following the same rules as `web3.eth.sendTransaction`.  All
+    of the gas estimates are requested from the node in a single batch.
+    """
+    transactions_to_estimate = [
+        transaction for transaction in transactions
+        if 'gas' not in transaction and 'data' in transaction
+    ]
+
+    for transaction in transactions:
+        if 'gas' not in transaction and 'data' not in transaction:
+            transaction['gas'] = DEFAULT_GAS
+
+    if not transactions_to_estimate:
+        return
+
+    gas_estimates = make_batch_request(web3, [
+        ('eth_estimateGas', [transaction])
+        for transaction in transactions_to_estimate
+    ])
+    gas_limit = get_block_gas_limit(web3)
+
+    for transaction, gas_estimate in zip(transactions_to_estimate, gas_estimates):
+        gas_estimate = to_decimal(gas_estimate)
+
+        if gas_estimate > gas_limit:
+            raise ValueError(
+                "Contract does not appear to be delpoyable within the "
+                "current network gas limits.  Estimated: {0}. Current gas "
+                "limit: {1}".format(gas_estimate, gas_limit)
+            )
+
+        transaction['gas'] = min(gas_limit, gas_estimate + gas_buffer)
+
+
+def get_transaction_sender(transaction):
+    sender = transaction.get('from')
+    if not sender:
+        return ''
+    return force_text(sender).lower()
+
+
+def fill_transaction_nonces(web3, transactions):
+    """
+    Assigns sequential nonces to the (formatted) `transactions` of each sender
+    which has more than one transaction in the batch, starting from the
+    sender's pending transaction count, so that all of the sender's
+    transactions can be in the mempool at the same time and be mined within
+    the same block.  All of the transaction counts are requested from the node
+    in a single batch.
+
+    Senders for which any of the transactions already specify a `nonce` are
+    left for the node to manage, as are all senders if the node is unable to
+    report pending transaction counts.
+    """
+    senders_with_nonces = {
+        get_transaction_sender(transaction)
+        for transaction in transactions
+        if 'nonce' in transaction
+    }
+    transaction_senders = [
+        get_transaction_sender(transaction)
+        for transaction in transactions
+    ]
+    senders = sorted({
+        sender
+        for sender in transaction_senders
+        if sender and
+        sender not in senders_with_nonces and
+        transaction_senders.count(sender) > 1
+    })
+
+    if not senders:
+        return
+
+    try:
+        transaction_counts = make_batch_request(web3, [
+            ('eth_getTransactionCount', [sender, 'pending'])
+            for sender in senders
+        ])
+    except ValueError:
+        # Some nodes, such as the `eth-testrpc` tester chain, do not support
+        # the `pending` block.
+        return
+
+    next_nonces = {
+        sender: to_decimal(transaction_count)
+        for sender, transaction_count in zip(senders, transaction_counts)
+    }
+
+    for sender, transaction in zip(transaction_senders, transactions):
+        if sender in next_nonces:
+            transaction['nonce'] = next_nonces[sender]
+            next_nonces[sender] += 1
+
+
+def send_transaction_batch(web3, transactions):
+    """
+    Sends the `transactions` to the node, returning a list of transaction
+    hashes and a list of errors, both in the same order as `transactions`.
+    Each transaction has either a hash, if it was sent, or an error.
+
+    Each sender's transactions are sent in the order they were given, with
+    the transactions of different senders sent together in JSON-RPC batch
+    requests.  Once one of a sender's transactions fails the remainder of
+    that sender's transactions are not sent.
+
+    Senders with more than one transaction in the batch have their
+    transactions given sequential nonces so that they can all be mined in the
+    same block.  If the node does not accept the nonces the transactions are
+    instead sent without them.
+    """
+    formatted_transactions = [
+        input_transaction_formatter(web3.eth, transaction)
+        for transaction in transactions
+    ]
+    fill_transaction_gas(web3, formatted_transactions)
+
+    explicit_nonce_indices = {
+        index for index, transaction in enumerate(formatted_transactions)
+        if 'nonce' in transaction
+    }
+    fill_transaction_nonces(web3, formatted_transactions)
+
+    transaction_senders = [
+        get_transaction_sender(transaction)
+        for transaction in formatted_transactions
+    ]
+    indices_by_sender = collections.OrderedDict(
+        (sender, [
+            index for index, transaction_sender in enumerate(transaction_senders)
+            if transaction_sender == sender
+        ])
+        for sender in sorted(set(transaction_senders))
+    )
+    assigned_nonce_indices = [
+        index for index, transaction in enumerate(formatted_transactions)
+        if 'nonce' in transaction and index not in explicit_nonce_indices
+    ]
+
+    transaction_hashes = [None] * len(transactions)
+    errors = [None] * len(transactions)
+
+    def send_transactions(indices):
+        results = make_batch_request_with_errors(web3, [
+            ('eth_sendTransaction', [formatted_transactions[index]])
+            for index in indices
+        ], sequential=True)
+        for index, (transaction_hash, error) in zip(indices, results):
+            transaction_hashes[index] = transaction_hash
+            errors[index] = error
+
+    if assigned_nonce_indices:
+        # The first transaction with an assigned nonce is sent on its own so
+        # that a node which rejects the nonce is detected before any of the
+        # other transactions have been sent.
+        probe_index = assigned_nonce_indices[0]
+        send_transactions([probe_index])
+        if errors[probe_index] is not None:
+            errors[probe_index] = None
+            for index in assigned_nonce_indices:
+                formatted_transactions[index].pop('nonce')
+
+    # The transactions are sent in rounds, with each round sending the next
+    # transaction of every sender which has not had a transaction fail.
+    while True:
+        next_indices = []
+        for sender, indices in indices_by_sender.items():
+            unsent_indices = [
+                index for index in indices
+                if transaction_hashes[index] is None
+            ]
+            if not unsent_indices:
+                continue
+            elif any(errors[index] is not None for index in indices):
+                for index in unsent_indices:
+                    if errors[index] is None:
+                        errors[index] = ValueError(
+                            "Transaction was not sent as an earlier transaction "
+                            "from {0} failed".format(sender or "the default account")
+                        )
+            else:
+                next_indices.append(unsent_indices[0])
+
+        if not next_indices:
+            break
+        send_transactions(next_indices)
+
+    return transaction_hashes, errors
+
+
+def submit_operation_batch(web3, operations, prepared_operations):
+    """
+    Submits each of the prepared `operations`, returning a list of the
+    submitted values and a list of the errors for the transactions which
+    could not be sent, both in the same order as `operations`.  When the batch
+    contains more than one transaction based operation their transactions are
+    sent together using `send_transaction_batch`.  Any other operations, and
+    a lone transaction, are submitted individually.
+    """
+    submitted = [None] * len(operations)
+    errors = [None] * len(operations)
+    transaction_indices = [
+        index
+        for index, operation in enumerate(operations)
+        if isinstance(operation, TransactionOperation)
+    ]
+
+    if len(transaction_indices) < 2:
+        transaction_indices = []
+
+    for index, (operation, prepared) in enumerate(zip(operations, prepared_operations)):
+        if index not in transaction_indices:
+            submitted[index] = operation.submit(prepared)
+
+    if transaction_indices:
+        transaction_hashes, transaction_errors = send_transaction_batch(web3, [
+            prepared_operations[index]['transaction']
+            for index in transaction_indices
+        ])
+
+        for index, transaction_hash, error in zip(transaction_indices,
+                                                  transaction_hashes,
+                                                  transaction_errors):
+            submitted[index] = transaction_hash
+            errors[index] = error
+
+    return submitted, errors
+
+
+def run_operation_batch(operations, chain, **kwargs):
+    """
+    Executes a batch of operations which do not depend on each other.  Every
+    operation is prepared and submitted before any of them are waited on and
+    the receipts are then awaited concurrently, so the whole batch only pays
+    for a single confirmation wait rather than one wait per operation.
+
+    Returns a list of operation receipts and a list of errors, both in the
+    same order as `operations`.  Each operation has either a receipt or the
+    error raised while sending its transaction or waiting for its receipt.
+    A failure does not stop the receipts of the other operations from being
+    waited on.
+    """
+    prepared_operations = [
+        operation.prepare(chain=chain, **kwargs)
+        for operation in operations
+    ]
+    submitted_operations, errors = submit_operation_batch(
+        chain.web3,
+        operations,
+        prepared_operations,
+    )
+    receipt_greenlets = [
+        None if error is not None else
+        gevent.spawn(operation.await_receipt, prepared, submitted)
+        for operation, prepared, submitted, error
+        in zip(operations, prepared_operations, submitted_operations, errors)
+    ]
+    spawned_greenlets = [
+        greenlet for greenlet in receipt_greenlets if greenlet is not None
+    ]
+
+    try:
+        gevent.joinall(spawned_greenlets)
+    finally:
+        gevent.killall(spawned_greenlets)
+
+    operation_receipts = [
+        None if greenlet is None else greenlet.value
+        for greenlet in receipt_greenlets
+    ]
+    errors = [
+        error if greenlet is None else greenlet.exception
+        for greenlet, error in zip(receipt_greenlets, errors)
+    ]
+    return operation_receipts, errors
+
+
+def execute_operation_batch(operations, chain, **kwargs):
+    """
+    Executes a batch of operations using `run_operation_batch`, returning the
+    operation receipts in the same order as `operations`.  If any of the
+    operations failed, the first error is raised once every other operation
+    has finished.
+    """
+    operation_receipts, errors = run_operation_batch(operations, chain, **kwargs)
+
+    for error in errors:
+        if error is not None:
+            raise error
+
+    return operation_receipts
+
+
+def is_deferred_receipt(operation_receipt):
+    """
+    Returns whether the `operation_receipt` holds a `receipt` which is still
+    being waited on in the background, such as those returned by
+    `SendTransaction` operations with `defer_receipt` set.
+    """
+    return (
+        isinstance(operation_receipt, dict) and
+        isinstance(operation_receipt.get('receipt'), gevent.Greenlet)
+    )
+
+
+def resolve_deferred_receipts(operation_receipts):
+    """
+    Waits for all of the deferred `operation_receipts`, returning a list of
+    the operation receipts with the pending `receipt` removed and a list of
+    errors, both in the same order.  Each operation has either a receipt or
+    the error raised while waiting for it.
+    """
+    receipt_greenlets = [
+        operation_receipt['receipt']
+        for operation_receipt in operation_receipts
+    ]
+
+    try:
+        gevent.joinall(receipt_greenlets)
+    finally:
+        gevent.killall(receipt_greenlets)
+
+    resolved_operation_receipts = [
+        None if not greenlet.successful() else {
+            key: value
+            for key, value in operation_receipt.items()
+            if key != 'receipt'
+        }
+        for greenlet, operation_receipt in zip(receipt_greenlets, operation_receipts)
+    ]
+    errors = [greenlet.exception for greenlet in receipt_greenlets]
+    return resolved_operation_receipts, errors
+
+
+class UnknownDependencies(Exception):
+    pass
+
+
+def get_deferred_registrar_keys(value):
+    """
+    Returns the set of registrar keys read by the deferred values found within
+    `value`.
+    """
+    if isinstance(value, type) and issubclass(value, RegistrarValue):
+        if not is_string(value.key):
+            raise UnknownDependencies("Deferred value has no registrar key")
+        return {force_text(value.key)}
+    elif isinstance(value, DeferredValue) or (
+        isinstance(value, type) and issubclass(value, DeferredValue)
+    ):
+        raise UnknownDependencies("Unable to determine what deferred value reads")
+    elif isinstance(value, dict):
+        return get_deferred_registrar_keys(list(value.keys()) + list(value.values()))
+    elif isinstance(value, (list, tuple)):
+        return set().union(*(get_deferred_registrar_keys(item) for item in value))
+    else:
+        return set()
+
+
+def get_address_key(address):
+    return "address/{0}".format(add_0x_prefix(force_text(address).lower()))
+
+
+def get_argument_address_keys(arguments):
+    """
+    Returns the set of keys for the literal addresses found within the
+    `arguments` of a contract deployment or function call.
+    """
+    if is_hex_address(arguments):
+        return {get_address_key(arguments)}
+    elif isinstance(arguments, (list, tuple)):
+        return set().union(*(get_argument_address_keys(item) for item in arguments))
+    else:
+        return set()
+
+
+def get_target_key(value):
+    """
+    Returns a key identifying the account targeted by `value` which may either
+    be a literal address or a deferred registrar value.
+    """
+    if isinstance(value, type) and issubclass(value, RegistrarValue):
+        return force_text(value.key)
+    elif is_string(value):
+        return get_address_key(value)
+    elif value is None:
+        return None
+    else:
+        raise UnknownDependencies("Unable to determine transaction target")
+
+
+def get_send_transaction_accesses(operation, compiled_contracts):
+    reads = get_deferred_registrar_keys([
+        operation.transaction,
+        operation.timeout,
+        operation.poll_interval,
+        operation.block_timeout,
+    ])
+    return reads, set(), get_target_key(operation.transaction.get('to'))
+
+
+def get_deploy_contract_accesses(operation, compiled_contracts):
+    reads = get_deferred_registrar_keys([
+        operation.contract_name,
+        operation.contract_registrar_name,
+        operation.transaction,
+        operation.arguments,
+        operation.libraries,
+        operation.timeout,
+        operation.verify,
+        operation.poll_interval,
+        operation.block_timeout,
+    ])
+
+    if reads:
+        # A deferred contract name or set of libraries means we cannot know
+        # which contract or links this operation will end up using.
+        raise UnknownDependencies("Deferred values in contract deployment")
+
+    contract_name = operation.contract_name
+    registrar_name = operation.contract_registrar_name or contract_name
+
+    library_dependencies = get_contract_library_dependencies(
+        compiled_contracts[contract_name]['code'],
+        set(operation.libraries.keys()).union(compiled_contracts.keys()),
+    )
+    reads = {
+        "contract/{0}".format(library_name)
+        for library_name in library_dependencies
+        if library_name not in operation.libraries
+    }
+    # The constructor may read the state of any account passed to it.
+    reads |= get_argument_address_keys(operation.arguments)
+    writes = {"contract/{0}".format(registrar_name)}
+
+    return reads, writes, None
+
+
+def get_transact_contract_accesses(operation, compiled_contracts):
+    reads = get_deferred_registrar_keys([
+        operation.contract_address,
+        operation.contract_name,
+        operation.method_name,
+        operation.arguments,
+        operation.transaction,
+        operation.timeout,
+        operation.poll_interval,
+        operation.block_timeout,
+    ])
+    # The called function may both read and modify the state of any account
+    # passed to it.
+    argument_keys = get_argument_address_keys(operation.arguments)
+    return reads | argument_keys, argument_keys, get_target_key(operation.contract_address)
+
+
+OPERATION_ACCESS_FNS = {
+    SendTransaction: get_send_transaction_accesses,
+    DeployContract: get_deploy_contract_accesses,
+    TransactContract: get_transact_contract_accesses,
+}
+
+
+def get_operation_accesses(operation, operation_key, compiled_contracts):
+    """
+    Returns the `(reads, writes)` sets of registrar keys for the operation.
+    Transactions sent to or from the same account are treated as both reading
+    and writing that account so that they keep their relative order.
+
+    Raises `UnknownDependencies` for operations which cannot be analysed.
+    """
+    try:
+        access_fn = OPERATION_ACCESS_FNS[type(operation)]
+    except KeyError:
+        raise UnknownDependencies(
+            "Unable to analyse operations of type {0}".format(type(operation))
+        )
+
+    reads, writes, target_key = access_fn(operation, compiled_contracts)
+
+    # The operation receipt is written to the registrar under the operation key.
+    writes = writes | {operation_key}
+
+    # Sending a transaction changes the balance and nonce of the sender, so
+    # the sender is treated as both read and written like the target.
+    sender_key = get_target_key(operation.transaction.get('from'))
+
+    for account_key in (target_key, sender_key):
+        if account_key is not None:
+            reads = reads | {account_key}
+            writes = writes | {account_key}
+
+    return reads, writes
+
+
+def get_known_operation_accesses(operation, operation_key, compiled_contracts):
+    """
+    Returns the `(reads, writes)` sets of registrar keys for the operation, or
+    `None` for operations which cannot be analysed.
+    """
+    try:
+        return get_operation_accesses(operation, operation_key, compiled_contracts)
+    except UnknownDependencies:
+        return None
+
+
+def is_key_conflict(key_a, key_b):
+    return any((
+        key_a == key_b,
+        key_a.startswith(key_b + '/'),
+        key_b.startswith(key_a + '/'),
+    ))
+
+
+def has_conflict(keys_a, keys_b):
+    return any(
+        is_key_conflict(key_a, key_b)
+        for key_a in keys_a
+        for key_b in keys_b
+    )
+
+
+def is_dependent(earlier_accesses, later_accesses):
+    if earlier_accesses is None or later_accesses is None:
+        return True
+
+    earlier_reads, earlier_writes = earlier_accesses
+    later_reads, later_writes = later_accesses
+
+    return any((
+        has_conflict(earlier_writes, later_reads),
+        has_conflict(earlier_writes, later_writes),
+        has_conflict(earlier_reads, later_writes),
+    ))
+
+
+def get_operation_dependency_graph(operations, operation_keys, compiled_contracts):
+    """
+    Returns a graph mapping each operation index to the set of indices of the
+    earlier operations that it depends on.  Operations which cannot be
+    analysed depend on, and are depended on by, every other operation.
+    """
+    all_accesses = [
+        get_known_operation_accesses(operation, operation_key, compiled_contracts)
+        for operation, operation_key in zip(operations, operation_keys)
+    ]
+
+    return {
+        index: {
+            earlier_index
+            for earlier_index in range(index)
+            if is_dependent(all_accesses[earlier_index], accesses)
+        }
+        for index, accesses in enumerate(all_accesses)
+    }
+
+
+def group_operations_into_batches(operations, operation_keys, compiled_contracts):
+    """
+    Groups the operations into batches of `(operation_index, operation)` pairs
+    such that no operation depends on another within the same batch.  Each
+    batch only depends on the batches before it.
+    """
+    dependency_graph = get_operation_dependency_graph(
+        operations,
+        operation_keys,
+        compiled_contracts,
+    )
+    return [
+        [(index, operations[index]) for index in sorted(batch_indices)]
+        for batch_indices in toposort(dependency_graph)
+    ]
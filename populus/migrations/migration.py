@@ -1,6 +1,9 @@
 import itertools
 import functools
 
+import gevent
+
+from pylru import lrucache
 from toposort import toposort
 
 from web3.utils.types import is_string
@@ -9,6 +12,14 @@ from .deferred import (
     generate_registrar_value_setters,
     Bool,
 )
+from .batch import (
+    get_known_operation_accesses,
+    group_operations_into_batches,
+    is_dependent,
+    is_deferred_receipt,
+    resolve_deferred_receipts,
+    run_operation_batch,
+)
 
 
 class Migration(object):
@@ -16,9 +27,12 @@ class Migration(object):
     dependencies = None
     operations = None
     compiled_contracts = None
+    batch_operations = False
 
     def __init__(self, chain):
         self.chain = chain
+        self.contract_factory_cache = lrucache(128)
+        self.function_abi_cache = lrucache(128)
 
     @property
     def registrar(self):
@@ -57,30 +71,147 @@ class Migration(object):
         # mark the operation as having been completed.
         Bool(self.chain, key=operation_key, value=True).set()
 
+    def get_operation_key(self, operation_index):
+        return "{prefix}/operation/{operation_index}".format(
+            prefix=self.migration_key,
+            operation_index=operation_index,
+        )
+
+    def get_operation_batches(self):
+        """
+        Returns the operations grouped into batches of `(operation_index,
+        operation)` pairs.  The operations within a batch must be independent
+        of each other as they are all submitted before any of them are waited
+        on.  By default every operation is placed in a batch of its own.
+
+        When `batch_operations` is set, the operations are analysed for the
+        registrar values and accounts they use and independent operations are
+        grouped into the same batch.
+        """
+        if self.batch_operations:
+            return group_operations_into_batches(
+                self.operations,
+                [
+                    self.get_operation_key(operation_index)
+                    for operation_index in range(len(self.operations))
+                ],
+                self.compiled_contracts,
+            )
+        return [
+            [(operation_index, operation)]
+            for operation_index, operation
+            in enumerate(self.operations)
+        ]
+
+    def resolve_deferred_operations(self, deferred_operations):
+        """
+        Waits for the receipts of the `(operation_key, operation_receipt,
+        accesses)` deferred operations and records them as completed.
+        """
+        operation_keys = [operation_key for operation_key, _, _ in deferred_operations]
+        operation_receipts, errors = resolve_deferred_receipts([
+            operation_receipt for _, operation_receipt, _ in deferred_operations
+        ])
+
+        # Every operation which succeeded is recorded before raising the first
+        # error so that re-running the migration does not repeat them.
+        for operation_key, operation_receipt, error in zip(operation_keys,
+                                                           operation_receipts,
+                                                           errors):
+            if error is None:
+                self.process_operation_receipt(operation_key, operation_receipt)
+
+        for error in errors:
+            if error is not None:
+                raise error
+
     def execute(self):
         if self.registrar.call().exists(self.migration_key):
             raise ValueError("This migration has already been run")
 
-        for operation_index, operation in enumerate(self.operations):
-            operation_key = "{prefix}/operation/{operation_index}".format(
-                prefix=self.migration_key,
-                operation_index=operation_index,
-            )
+        deferred_operations = []
 
-            operation_alread_executed = (
-                self.registrar.call().exists(operation_key) and
-                self.registrar.call().getBool(operation_key)
-            )
-            if operation_alread_executed:
-                # raise or continue?
-                raise ValueError("This operation has already been run")
+        try:
+            for operation_batch in self.get_operation_batches():
+                operation_keys = [
+                    self.get_operation_key(operation_index)
+                    for operation_index, _ in operation_batch
+                ]
 
-            operation_receipt = operation.execute(
-                chain=self.chain,
-                compiled_contracts=self.compiled_contracts,
-            )
+                for operation_key in operation_keys:
+                    operation_alread_executed = (
+                        self.registrar.call().exists(operation_key) and
+                        self.registrar.call().getBool(operation_key)
+                    )
+                    if operation_alread_executed:
+                        # raise or continue?
+                        raise ValueError("This operation has already been run")
+
+                batch_accesses = [
+                    get_known_operation_accesses(
+                        operation,
+                        operation_key,
+                        self.compiled_contracts,
+                    )
+                    for operation_key, (_, operation)
+                    in zip(operation_keys, operation_batch)
+                ]
+
+                # Deferred receipts only need to be waited on once an
+                # operation which depends on them is about to be executed.
+                blocking_operations = []
+                pending_operations = []
+                for deferred_operation in deferred_operations:
+                    _, _, deferred_accesses = deferred_operation
+                    if any(is_dependent(deferred_accesses, accesses)
+                           for accesses in batch_accesses):
+                        blocking_operations.append(deferred_operation)
+                    else:
+                        pending_operations.append(deferred_operation)
+
+                deferred_operations = pending_operations
+                self.resolve_deferred_operations(blocking_operations)
+
+                operation_receipts, errors = run_operation_batch(
+                    [operation for _, operation in operation_batch],
+                    chain=self.chain,
+                    compiled_contracts=self.compiled_contracts,
+                    contract_factory_cache=self.contract_factory_cache,
+                    function_abi_cache=self.function_abi_cache,
+                )
 
-            self.process_operation_receipt(operation_key, operation_receipt)
+                # Every operation which succeeded is recorded, even if others
+                # in the batch failed, so that re-running the migration does
+                # not repeat them.
+                batch_results = zip(
+                    operation_keys,
+                    operation_receipts,
+                    errors,
+                    batch_accesses,
+                )
+                for operation_key, operation_receipt, error, accesses in batch_results:
+                    if error is not None:
+                        continue
+                    elif is_deferred_receipt(operation_receipt):
+                        deferred_operations.append(
+                            (operation_key, operation_receipt, accesses),
+                        )
+                    else:
+                        self.process_operation_receipt(operation_key, operation_receipt)
+
+                for error in errors:
+                    if error is not None:
+                        raise error
+
+            # Operations with deferred receipts are only recorded as completed
+            # once their transactions have been mined, which must happen before
+            # the migration itself can be marked as executed.
+            self.resolve_deferred_operations(deferred_operations)
+        finally:
+            gevent.killall([
+                operation_receipt['receipt']
+                for _, operation_receipt, _ in deferred_operations
+            ])
 
         self.mark_as_executed()
 
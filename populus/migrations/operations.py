@@ -1,14 +1,15 @@
 import types
 
-from web3.utils.string import (
-    force_text,
-)
+import gevent
 
 from populus.utils.contracts import (
     get_contract_library_dependencies,
+    get_contract_factory_from_compiled_contracts,
+    get_contract_function_data,
 )
 from populus.utils.deploy import (
-    deploy_contract,
+    build_deploy_transaction,
+    verify_contract_deployment,
 )
 
 from .registrar import (
@@ -29,6 +30,28 @@ class Operation(object):
             "The `execute` method must be implemented by each Operation subclass"
         )
 
+    def prepare(self, **kwargs):
+        """
+        Resolve everything the operation needs ahead of sending anything to the
+        chain.  The return value is handed to both `submit` and
+        `await_receipt`.
+        """
+        return kwargs
+
+    def submit(self, prepared):
+        """
+        Send the operation to the chain without waiting for it to be mined.
+        Operations which do not send a transaction simply run `execute` here.
+        """
+        return self.execute(**prepared)
+
+    def await_receipt(self, prepared, submitted):
+        """
+        Wait for the value returned from `submit` to be finalized and return
+        the operation receipt.
+        """
+        return submitted
+
     def deconstruct(self):
         deferred_kwargs = {
             key: getattr(self, key)
@@ -67,18 +90,97 @@ class RunPython(Operation):
         return self.callback(**kwargs)
 
 
-class SendTransaction(Operation):
+class TransactionOperation(Operation):
+    """
+    Base class for operations which send a single transaction.  Execution is
+    split into `prepare`, `submit` and `await_receipt` so that a batch of
+    independent operations can have all of their transactions sent before
+    waiting on any of them to be mined.
+    """
+    poll_interval = None
+    block_timeout = None
+
+    # Transaction values which are computed by the operation and thus may not
+    # be provided in the `transaction` argument.
+    forbidden_transaction_keys = frozenset()
+
+    def validate_transaction(self, transaction):
+        forbidden_keys = self.forbidden_transaction_keys.intersection(transaction.keys())
+        if forbidden_keys:
+            raise ValueError(
+                "Invalid configuration.  You cannot specify {0} values in `{1}` "
+                "transactions.".format(
+                    ' or '.join('`{0}`'.format(key) for key in sorted(forbidden_keys)),
+                    type(self).__name__,
+                )
+            )
+
+    def get_poll_interval(self, chain):
+        """
+        Returns the interval used to poll for the transaction receipt.  Unless
+        set explicitly this is derived from the chain's block time so that
+        fast development chains are not kept waiting and public nodes are not
+        polled more often than necessary.
+        """
+        poll_interval = Resolver(chain)(self.poll_interval)
+        if poll_interval is None:
+            return chain.get_poll_interval()
+        return poll_interval
+
+    def get_wait_kwargs(self, chain, timeout):
+        """
+        Returns the keyword arguments for waiting on the transaction receipt.
+        """
+        return {
+            'timeout': timeout,
+            'poll_interval': self.get_poll_interval(chain),
+            'block_timeout': Resolver(chain)(self.block_timeout),
+        }
+
+    def execute(self, **kwargs):
+        prepared = self.prepare(**kwargs)
+        transaction_hash = self.submit(prepared)
+        return self.await_receipt(prepared, transaction_hash)
+
+    def prepare(self, chain, **kwargs):
+        raise NotImplementedError(
+            "The `prepare` method must be implemented by each TransactionOperation subclass"
+        )
+
+    def submit(self, prepared):
+        chain = prepared['chain']
+        return chain.web3.eth.sendTransaction(prepared['transaction'])
+
+    def await_receipt(self, prepared, transaction_hash):
+        raise NotImplementedError(
+            "The `await_receipt` method must be implemented by each "
+            "TransactionOperation subclass"
+        )
+
+
+class SendTransaction(TransactionOperation):
     """
     A migration operation that sends a transaction.
     """
     transaction = None
     timeout = 180
+    poll_interval = None
+    block_timeout = None
+    defer_receipt = False
 
-    def __init__(self, transaction, timeout=180):
+    def __init__(self,
+                 transaction,
+                 timeout=180,
+                 poll_interval=None,
+                 defer_receipt=False,
+                 block_timeout=None):
         self.transaction = transaction
         self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.defer_receipt = defer_receipt
+        self.block_timeout = block_timeout
 
-    def execute(self, chain, **kwargs):
+    def prepare(self, chain, **kwargs):
         resolver = Resolver(chain)
 
         transaction = {
@@ -87,21 +189,47 @@ class SendTransaction(Operation):
         }
         timeout = resolver(self.timeout)
 
-        transaction_hash = chain.web3.eth.sendTransaction(transaction)
-        if timeout is not None:
-            chain.wait.for_receipt(transaction_hash, timeout=timeout)
+        return {
+            'chain': chain,
+            'transaction': transaction,
+            'timeout': timeout,
+        }
+
+    def await_receipt(self, prepared, transaction_hash):
+        chain = prepared['chain']
+        timeout = prepared['timeout']
+
+        if timeout is not None and self.defer_receipt:
+            # Poll for the receipt in the background, leaving it to the caller
+            # to wait on the returned greenlet.
+            return {
+                'transaction-hash': transaction_hash,
+                'receipt': gevent.spawn(
+                    chain.wait.for_receipt,
+                    transaction_hash,
+                    **self.get_wait_kwargs(chain, timeout)
+                ),
+            }
+        elif timeout is not None:
+            chain.wait.for_receipt(
+                transaction_hash,
+                **self.get_wait_kwargs(chain, timeout)
+            )
         return {
             'transaction-hash': transaction_hash,
         }
 
 
-class DeployContract(Operation):
+class DeployContract(TransactionOperation):
     contract_name = None
     contract_registrar_name = None
     transaction = None
     timeout = 180
+    poll_interval = None
+    block_timeout = None
     libraries = None
     verify = True
+    forbidden_transaction_keys = frozenset(('data', 'to'))
 
     def __init__(self,
                  contract_name,
@@ -110,7 +238,9 @@ class DeployContract(Operation):
                  verify=True,
                  libraries=None,
                  timeout=180,
-                 contract_registrar_name=None):
+                 contract_registrar_name=None,
+                 poll_interval=None,
+                 block_timeout=None):
         if libraries is None:
             libraries = {}
 
@@ -127,11 +257,7 @@ class DeployContract(Operation):
         if transaction is None:
             transaction = {}
 
-        if 'data' in transaction or 'to' in transaction:
-            raise ValueError(
-                "Invalid configuration.  You cannot specify `data` or `to` "
-                "values in `DeployContract` transactions."
-            )
+        self.validate_transaction(transaction)
 
         if arguments is None:
             arguments = []
@@ -139,11 +265,17 @@ class DeployContract(Operation):
         self.transaction = transaction
         self.arguments = arguments
         self.verify = verify
+        self.poll_interval = poll_interval
+        self.block_timeout = block_timeout
 
         if timeout is not None:
             self.timeout = timeout
 
-    def execute(self, chain, compiled_contracts, **kwargs):
+    def prepare(self,
+                chain,
+                compiled_contracts,
+                contract_factory_cache=None,
+                **kwargs):
         resolver = Resolver(chain)
 
         contract_name = resolver(self.contract_name)
@@ -162,12 +294,11 @@ class DeployContract(Operation):
         timeout = resolver(self.timeout)
         verify = resolver(self.verify)
 
-        contract_data = compiled_contracts[contract_name]
-        BaseContractFactory = chain.web3.eth.contract(
-            abi=contract_data['abi'],
-            code=contract_data['code'],
-            code_runtime=contract_data['code_runtime'],
-            source=contract_data.get('source'),
+        BaseContractFactory = get_contract_factory_from_compiled_contracts(
+            chain.web3,
+            compiled_contracts,
+            contract_name,
+            cache=contract_factory_cache,
         )
 
         all_known_contract_names = set(libraries.keys()).union(
@@ -201,34 +332,45 @@ class DeployContract(Operation):
             in library_dependencies
         }
 
-        deploy_transaction_hash, contract_factory = deploy_contract(
-            chain=chain,
-            contract_name=contract_name,
-            contract_factory=BaseContractFactory,
-            deploy_transaction=transaction,
-            deploy_arguments=arguments,
-            link_dependencies=link_dependencies,
+        # `transaction` is a fresh dictionary built by resolving
+        # `self.transaction` so it is safe to update in place.
+        contract_factory, transaction = build_deploy_transaction(
+            chain.web3,
+            BaseContractFactory,
+            transaction,
+            arguments,
+            link_dependencies,
         )
 
+        return {
+            'chain': chain,
+            'contract_name': contract_name,
+            'contract_registrar_name': contract_registrar_name,
+            'contract_factory': contract_factory,
+            'transaction': transaction,
+            'timeout': timeout,
+            'verify': verify,
+        }
+
+    def await_receipt(self, prepared, deploy_transaction_hash):
+        chain = prepared['chain']
+        contract_factory = prepared['contract_factory']
+        contract_name = prepared['contract_name']
+        contract_registrar_name = prepared['contract_registrar_name']
+        timeout = prepared['timeout']
+        verify = prepared['verify']
+
         if timeout is not None:
             contract_address = chain.wait.for_contract_address(
                 deploy_transaction_hash,
-                timeout=timeout,
+                **self.get_wait_kwargs(chain, timeout)
             )
             if verify:
-                code = force_text(chain.web3.eth.getCode(contract_address))
-                expected_code = force_text(contract_factory.code_runtime)
-                if code != expected_code:
-                    raise ValueError(
-                        "Bytecode @ {0} does not match expected contract "
-                        "bytecode.\n\n"
-                        "expected : '{1}'\n"
-                        "actual   : '{2}'\n".format(
-                            contract_address,
-                            expected_code,
-                            code,
-                        ),
-                    )
+                verify_contract_deployment(
+                    chain.web3,
+                    contract_address,
+                    contract_factory,
+                )
             return {
                 'deploy-transaction-hash': deploy_transaction_hash,
                 'canonical-contract-address': Address.defer(
@@ -244,7 +386,7 @@ class DeployContract(Operation):
         }
 
 
-class TransactContract(Operation):
+class TransactContract(TransactionOperation):
     contract_address = None
     contract_name = None
     method_name = None
@@ -252,6 +394,9 @@ class TransactContract(Operation):
     transaction = None
 
     timeout = 180
+    poll_interval = None
+    block_timeout = None
+    forbidden_transaction_keys = frozenset(('data', 'to'))
 
     def __init__(self,
                  contract_address,
@@ -259,7 +404,9 @@ class TransactContract(Operation):
                  method_name,
                  arguments=None,
                  transaction=None,
-                 timeout=180):
+                 timeout=180,
+                 poll_interval=None,
+                 block_timeout=None):
         self.contract_address = contract_address
         self.contract_name = contract_name
         self.method_name = method_name
@@ -271,12 +418,21 @@ class TransactContract(Operation):
         if transaction is None:
             transaction = {}
 
+        self.validate_transaction(transaction)
+
         self.transaction = transaction
+        self.poll_interval = poll_interval
+        self.block_timeout = block_timeout
 
         if timeout is not None:
             self.timeout = timeout
 
-    def execute(self, chain, compiled_contracts, **kwargs):
+    def prepare(self,
+                chain,
+                compiled_contracts,
+                contract_factory_cache=None,
+                function_abi_cache=None,
+                **kwargs):
         resolver = Resolver(chain)
 
         contract_address = resolver(self.contract_address)
@@ -294,21 +450,39 @@ class TransactContract(Operation):
         if not contract_address:
             raise ValueError("cannot transact without an address")
 
-        contract_data = compiled_contracts[contract_name]
-        contract = chain.web3.eth.contract(
-            address=contract_address,
-            abi=contract_data['abi'],
-            code=contract_data['code'],
-            code_runtime=contract_data['code_runtime'],
-            source=contract_data.get('source'),
+        ContractFactory = get_contract_factory_from_compiled_contracts(
+            chain.web3,
+            compiled_contracts,
+            contract_name,
+            cache=contract_factory_cache,
         )
+        contract = ContractFactory(address=contract_address)
 
-        transactor = contract.transact(transaction)
-        method = getattr(transactor, method_name)
-        transaction_hash = method(*arguments)
+        transaction['data'] = get_contract_function_data(
+            contract,
+            method_name,
+            arguments,
+            cache=function_abi_cache,
+        )
+        transaction['to'] = contract.address
+        if 'from' not in transaction:
+            transaction['from'] = chain.web3.eth.coinbase
+
+        return {
+            'chain': chain,
+            'transaction': transaction,
+            'timeout': timeout,
+        }
+
+    def await_receipt(self, prepared, transaction_hash):
+        chain = prepared['chain']
+        timeout = prepared['timeout']
 
         if timeout is not None:
-            chain.wait.for_receipt(transaction_hash, timeout=timeout)
+            chain.wait.for_receipt(
+                transaction_hash,
+                **self.get_wait_kwargs(chain, timeout)
+            )
 
         return {
             'transaction-hash': transaction_hash,
@@ -322,12 +496,12 @@ class DeployRegistrar(DeployContract):
             **kwargs
         )
 
-    def execute(self, chain, **kwargs):
+    def prepare(self, chain, **kwargs):
         kwargs.pop('compiled_contracts', None)
         compiled_contracts = {
             'Registrar': get_compiled_registrar_contract(),
         }
-        return super(DeployRegistrar, self).execute(
+        return super(DeployRegistrar, self).prepare(
             chain=chain,
             compiled_contracts=compiled_contracts,
             **kwargs
@@ -1,5 +1,7 @@
 import os
 
+from pylru import lrudecorator
+
 from solc import (
     compile_files,
     get_solc_version,
@@ -29,7 +31,13 @@ REGISTRAR_V3_SOURCE_PATH = os.path.join(BASE_DIR, 'RegistrarV3.sol')
 REGISTRAR_V4_SOURCE_PATH = os.path.join(BASE_DIR, 'RegistrarV4.sol')
 
 
+@lrudecorator(1)
 def get_compiled_registrar_contract():
+    """
+    Compiles the registrar contract source for the installed version of solc.
+    The result is cached for the lifetime of the process as compiling is
+    dominated by the cost of starting solc.
+    """
     if is_solc_03x():
         compiled_contracts = compile_files([REGISTRAR_V3_SOURCE_PATH])
     elif is_solc_04x():
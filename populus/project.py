@@ -34,7 +34,7 @@ from populus.migrations.loading import (
 )
 from populus.compilation import (
     find_project_contracts,
-    compile_project_contracts,
+    compile_project_contracts_with_cache,
 )
 
 from populus.chain import (
@@ -167,7 +167,7 @@ class Project(object):
             self._cached_compiled_contracts_mtime = self.get_source_modification_time()
             # TODO: the hard coded `optimize=True` should be configurable
             # somehow.
-            _, self._cached_compiled_contracts = compile_project_contracts(
+            _, self._cached_compiled_contracts = compile_project_contracts_with_cache(
                 project_dir=self.project_dir,
                 optimize=True,
             )
@@ -6,11 +6,38 @@ import functools
 
 import toposort
 
+from pylru import lrudecorator
+
+from eth_abi import (
+    encode_abi,
+)
+
+from web3.utils.crypto import (
+    sha3,
+)
+from web3.utils.encoding import (
+    decode_hex,
+    encode_hex,
+)
 from web3.utils.formatting import (
+    add_0x_prefix,
     remove_0x_prefix,
 )
 from web3.utils.string import (
     coerce_args_to_text,
+    coerce_return_to_text,
+    force_bytes,
+    force_obj_to_bytes,
+)
+from web3.utils.abi import (
+    check_if_arguments_can_be_encoded,
+    filter_by_argument_count,
+    filter_by_encodability,
+    filter_by_name,
+    filter_by_type,
+    function_abi_to_4byte_selector,
+    get_abi_input_types,
+    get_constructor_abi,
 )
 
 from populus.utils.functional import (
@@ -53,6 +80,158 @@ def construct_contract_factories(web3, contracts):
     return package_contracts(contract_classes)
 
 
+def get_contract_factory_from_compiled_contracts(web3,
+                                                 compiled_contracts,
+                                                 contract_name,
+                                                 cache=None):
+    """
+    Returns a contract factory for `contract_name`.  When a `cache` mapping is
+    provided, factories are reused across calls for as long as the contract
+    data for `contract_name` is the same object.
+    """
+    contract_data = compiled_contracts[contract_name]
+    cache_key = (contract_name, id(contract_data))
+
+    if cache is not None and cache_key in cache:
+        cached_contract_data, contract_factory = cache[cache_key]
+        if cached_contract_data is contract_data:
+            return contract_factory
+
+    contract_factory = web3.eth.contract(
+        abi=contract_data['abi'],
+        code=contract_data['code'],
+        code_runtime=contract_data['code_runtime'],
+        source=contract_data.get('source'),
+    )
+
+    if cache is not None:
+        cache[cache_key] = (contract_data, contract_factory)
+
+    return contract_factory
+
+
+def get_contract_function_abi(contract, function_name, arguments, cache=None):
+    """
+    Returns the ABI of the function named `function_name` on `contract` which
+    matches the given positional `arguments`, following the same rules as web3
+    whose own lookup is not public in all of the supported versions.
+
+    When a `cache` mapping is provided, the ABI is reused across calls for
+    functions which can be identified by their name and number of arguments
+    alone.  Overloaded functions with the same number of arguments are
+    matched against the argument values on every call.
+    """
+    cache_key = (type(contract), function_name, len(arguments))
+
+    if cache is not None and cache_key in cache:
+        return cache[cache_key]
+
+    candidates = filter_by_argument_count(
+        len(arguments),
+        filter_by_name(function_name, filter_by_type('function', contract.abi)),
+    )
+
+    if len(candidates) == 1:
+        if cache is not None:
+            cache[cache_key] = candidates[0]
+        return candidates[0]
+
+    candidates = filter_by_encodability(force_obj_to_bytes(arguments), {}, candidates)
+
+    if len(candidates) == 1:
+        return candidates[0]
+    elif not candidates:
+        raise ValueError("No matching functions found")
+    else:
+        raise ValueError("Multiple functions found")
+
+
+def encode_abi_arguments(abi, arguments, prefix):
+    """
+    Returns the hex encoded `arguments` for the function or constructor `abi`
+    appended to the hex encoded `prefix`.
+    """
+    encoded_arguments = encode_abi(
+        get_abi_input_types(abi),
+        force_obj_to_bytes(arguments),
+    )
+    return add_0x_prefix(
+        force_bytes(remove_0x_prefix(prefix)) +
+        force_bytes(remove_0x_prefix(encode_hex(encoded_arguments)))
+    )
+
+
+@coerce_return_to_text
+def get_contract_function_data(contract, function_name, arguments, cache=None):
+    """
+    Returns the transaction `data` for calling `function_name` on `contract`
+    with the given positional `arguments`.
+    """
+    function_abi = get_contract_function_abi(
+        contract,
+        function_name,
+        arguments,
+        cache=cache,
+    )
+    return encode_abi_arguments(
+        function_abi,
+        arguments,
+        function_abi_to_4byte_selector(function_abi),
+    )
+
+
+@coerce_return_to_text
+def get_contract_constructor_data(contract_factory, arguments=None):
+    """
+    Returns the transaction `data` for deploying `contract_factory` with the
+    given positional constructor `arguments`.
+    """
+    if arguments is None:
+        arguments = []
+
+    constructor_abi = get_constructor_abi(contract_factory.abi)
+
+    if not constructor_abi:
+        return add_0x_prefix(contract_factory.code)
+
+    if len(arguments) != len(constructor_abi['inputs']):
+        raise ValueError(
+            "This contract requires {0} constructor arguments".format(
+                len(constructor_abi['inputs']),
+            )
+        )
+
+    is_encodable = check_if_arguments_can_be_encoded(
+        constructor_abi,
+        force_obj_to_bytes(arguments),
+        {},
+    )
+    if not is_encodable:
+        raise ValueError("Unable to encode provided arguments.")
+
+    return encode_abi_arguments(
+        constructor_abi,
+        arguments,
+        contract_factory.code,
+    )
+
+
+def get_code_hash(code):
+    """
+    Returns the `sha3` hex digest of the hex encoded bytecode `code`.
+    """
+    return sha3(decode_hex(code))
+
+
+@lrudecorator(128)
+def get_expected_code_hash(code):
+    """
+    Cached variant of `get_code_hash` for the bytecode of contract factories
+    which is checked against every deployment of that contract.
+    """
+    return get_code_hash(code)
+
+
 def load_compiled_contract_json(project_dir):
     compiled_contracts_path = get_compiled_contracts_file_path(project_dir)
 
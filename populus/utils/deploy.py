@@ -1,7 +1,14 @@
 import itertools
 from collections import OrderedDict
 
+from web3.utils.string import (
+    force_text,
+)
+
 from populus.utils.contracts import (
+    get_code_hash,
+    get_contract_constructor_data,
+    get_expected_code_hash,
     get_shallow_dependency_graph,
     get_contract_deploy_order,
     get_recursive_contract_dependencies,
@@ -32,6 +39,77 @@ def get_deploy_order(contracts_to_deploy, compiled_contracts):
     return OrderedDict(deploy_order)
 
 
+def link_contract_factory(web3, contract_factory, link_dependencies=None):
+    if link_dependencies is None:
+        link_dependencies = {}
+
+    code = link_bytecode(contract_factory.code, **link_dependencies)
+    code_runtime = link_bytecode(contract_factory.code_runtime, **link_dependencies)
+
+    return web3.eth.contract(
+        abi=contract_factory.abi,
+        code=code,
+        code_runtime=code_runtime,
+        source=contract_factory.source,
+    )
+
+
+def build_deploy_transaction(web3,
+                             contract_factory,
+                             transaction,
+                             arguments=None,
+                             link_dependencies=None):
+    """
+    Links `contract_factory` against `link_dependencies` and sets the `data`
+    of `transaction` to the contract's constructor data for `arguments`.  The
+    `transaction` is updated in place.
+
+    Returns the linked contract factory along with the transaction.
+    """
+    if link_dependencies:
+        contract_factory = link_contract_factory(
+            web3,
+            contract_factory,
+            link_dependencies,
+        )
+
+    if not contract_factory.code:
+        raise ValueError(
+            "Cannot deploy a contract that does not have 'code' associated "
+            "with it"
+        )
+
+    transaction['data'] = get_contract_constructor_data(
+        contract_factory,
+        arguments,
+    )
+
+    return contract_factory, transaction
+
+
+def verify_contract_deployment(web3, contract_address, contract_factory):
+    """
+    Raises a `ValueError` if the code at `contract_address` does not match
+    the runtime bytecode of `contract_factory`.
+    """
+    code = web3.eth.getCode(contract_address)
+    expected_code = contract_factory.code_runtime
+
+    # compare digests of the raw bytes rather than the hex strings which may
+    # differ in case or `0x` prefix.
+    if get_code_hash(code) != get_expected_code_hash(expected_code):
+        raise ValueError(
+            "Bytecode @ {0} does not match expected contract "
+            "bytecode.\n\n"
+            "expected : '{1}'\n"
+            "actual   : '{2}'\n".format(
+                contract_address,
+                force_text(expected_code),
+                force_text(code),
+            ),
+        )
+
+
 def deploy_contract(chain,
                     contract_name,
                     contract_factory=None,
@@ -41,16 +119,10 @@ def deploy_contract(chain,
     if contract_factory is None:
         contract_factory = chain.contract_factories[contract_name]
 
-    web3 = chain.web3
-
-    code = link_bytecode(contract_factory.code, **link_dependencies)
-    code_runtime = link_bytecode(contract_factory.code_runtime, **link_dependencies)
-
-    ContractFactory = web3.eth.contract(
-        abi=contract_factory.abi,
-        code=code,
-        code_runtime=code_runtime,
-        source=contract_factory.source,
+    ContractFactory = link_contract_factory(
+        chain.web3,
+        contract_factory,
+        link_dependencies,
     )
 
     deploy_transaction_hash = ContractFactory.deploy(
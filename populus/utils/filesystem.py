@@ -73,6 +73,19 @@ def get_compiled_contracts_file_path(project_dir):
     return os.path.join(build_dir, COMPILED_CONTRACTS_FILENAME)
 
 
+COMPILED_CONTRACTS_CACHE_DIR = "./compile_cache/"
+
+
+def get_compiled_contracts_cache_dir(project_dir):
+    build_dir = get_build_dir(project_dir)
+    return os.path.join(build_dir, COMPILED_CONTRACTS_CACHE_DIR)
+
+
+def get_compiled_contracts_cache_file_path(project_dir, source_hash):
+    cache_dir = get_compiled_contracts_cache_dir(project_dir)
+    return os.path.join(cache_dir, "compile_{0}.json.gz".format(source_hash))
+
+
 BLOCKCHAIN_DIR = "./chains/"
 
 
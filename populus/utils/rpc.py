@@ -0,0 +1,188 @@
+import json
+import contextlib
+
+import gevent
+from gevent.pool import Pool
+from geventhttpclient import HTTPClient
+
+from web3.providers.rpc import RPCProvider
+from web3.utils.string import (
+    force_bytes,
+    force_obj_to_text,
+    force_text,
+)
+
+
+REQUEST_POOL_SIZE = 16
+
+
+class BatchRequestRejected(ValueError):
+    pass
+
+
+def make_request(web3, method, params):
+    """
+    Sends a single JSON-RPC request returning a `(result, error)` pair where
+    `error` is the `ValueError` raised by `web3` if the node returned an error.
+    """
+    try:
+        return web3._requestManager.request_blocking(method, params), None
+    except ValueError as error:
+        return None, error
+
+
+def get_results(results_and_errors):
+    """
+    Returns the results from the `(result, error)` pairs, raising the first
+    error if there is one.
+    """
+    for _, error in results_and_errors:
+        if error is not None:
+            raise error
+    return [result for result, _ in results_and_errors]
+
+
+def make_concurrent_requests_with_errors(web3, requests, pool_size=REQUEST_POOL_SIZE):
+    pool = Pool(pool_size)
+    request_greenlets = [
+        pool.spawn(make_request, web3, method, params)
+        for method, params in requests
+    ]
+
+    try:
+        gevent.joinall(request_greenlets, raise_error=True)
+    finally:
+        gevent.killall(request_greenlets)
+
+    return [greenlet.value for greenlet in request_greenlets]
+
+
+def make_concurrent_requests(web3, requests, pool_size=REQUEST_POOL_SIZE):
+    """
+    Send each of the `(method, params)` requests individually, with up to
+    `pool_size` of them in flight at once.  Returns the results in the same
+    order as `requests`.
+
+    This only helps with providers which open a connection per request, like
+    the `RPCProvider`.  The `IPCProvider` holds a lock around each request so
+    the requests would still be sent one at a time.
+    """
+    return get_results(make_concurrent_requests_with_errors(web3, requests, pool_size))
+
+
+def make_http_batch_request(provider, requests):
+    batch = [
+        {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(provider.request_counter),
+        }
+        for method, params in requests
+    ]
+    request_data = force_bytes(json.dumps(force_obj_to_text(batch)))
+
+    client_kwargs = {
+        'ssl': getattr(provider, 'ssl', False),
+    }
+    # The connection settings are only present on the `RPCProvider` of newer
+    # versions of web3, otherwise the `HTTPClient` defaults are used.
+    for timeout_name in ('connection_timeout', 'network_timeout'):
+        if hasattr(provider, timeout_name):
+            client_kwargs[timeout_name] = getattr(provider, timeout_name)
+
+    client = HTTPClient(
+        host=provider.host,
+        port=provider.port,
+        headers={
+            'Content-Type': 'application/json',
+        },
+        **client_kwargs
+    )
+    with contextlib.closing(client):
+        response = client.post(provider.path, body=request_data)
+        response_body = response.read()
+
+    responses = json.loads(force_text(response_body))
+
+    if isinstance(responses, dict):
+        # A single response object is returned when the node rejects the batch
+        # as a whole, typically because it does not support batch requests.
+        raise BatchRequestRejected(responses.get("error", responses))
+
+    # The JSON-RPC spec allows responses to come back in any order so they
+    # are matched back up to their requests by `id`.
+    responses_by_id = {
+        response.get('id'): response for response in responses
+    }
+
+    # The error responses for requests the node could not read, such as
+    # invalid requests, have a null `id`.  Any request left without a
+    # response of its own is given one of these errors.
+    unmatched_response = responses_by_id.get(None, {
+        "error": "The node did not return a response for the request",
+    })
+    missing_response = {
+        "error": unmatched_response.get("error", unmatched_response),
+    }
+    return [
+        responses_by_id.get(request['id'], missing_response)
+        for request in batch
+    ]
+
+
+def make_sequential_requests_with_errors(web3, requests):
+    return [
+        make_request(web3, method, params)
+        for method, params in requests
+    ]
+
+
+def make_batch_request_with_errors(web3, requests, sequential=False):
+    """
+    Sends the `(method, params)` JSON-RPC requests in the same way as
+    `make_batch_request`, but returns a `(result, error)` pair for each of the
+    requests rather than raising when any of them results in an error.  Every
+    request is sent even if earlier ones fail.
+    """
+    requests = list(requests)
+
+    if not requests:
+        return []
+
+    provider = web3.currentProvider
+
+    if not isinstance(provider, RPCProvider):
+        return make_sequential_requests_with_errors(web3, requests)
+
+    if sequential:
+        fallback_fn = make_sequential_requests_with_errors
+    else:
+        fallback_fn = make_concurrent_requests_with_errors
+
+    try:
+        responses = make_http_batch_request(provider, requests)
+    except BatchRequestRejected:
+        return fallback_fn(web3, requests)
+
+    return [
+        (None, ValueError(response["error"])) if "error" in response
+        else (response["result"], None)
+        for response in responses
+    ]
+
+
+def make_batch_request(web3, requests, sequential=False):
+    """
+    Send a sequence of `(method, params)` JSON-RPC requests to the node
+    returning the results in the same order as `requests`.
+
+    For HTTP based providers all of the requests are sent as a single JSON-RPC
+    batch request.  If the node rejects batch requests they are instead sent
+    individually, concurrently unless `sequential` is set in which case they
+    are sent one at a time in order.  Other providers, such as the
+    `IPCProvider` which can only handle one request at a time, send the
+    requests one at a time in order.  As with `web3`, a `ValueError` is raised
+    if any of the requests results in an error.
+    """
+    return get_results(make_batch_request_with_errors(web3, requests, sequential))
@@ -1,3 +1,5 @@
+import sys
+import json
 import random
 import gevent
 
@@ -6,12 +8,100 @@ from web3.providers.rpc import TestRPCProvider
 from .empty import empty
 
 
-def wait_for_transaction_receipt(web3, txn_hash, timeout=120, poll_interval=None):
+if sys.version_info.major == 2:
+    JSONDecodeError = ValueError
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+
+MIN_POLL_INTERVAL = 0.1
+MAX_POLL_INTERVAL = 5
+POLL_INTERVAL_SAMPLE_SIZE = 10
+
+
+def get_average_block_time(web3, sample_size=POLL_INTERVAL_SAMPLE_SIZE, min_sample_size=1):
+    """
+    Returns the average number of seconds between the most recent
+    `sample_size` blocks, or `None` if fewer than `min_sample_size` block
+    intervals are available.  The genesis block is left out of the sample as
+    its timestamp is typically unrelated to when the chain started mining.
+    """
+    latest_block = web3.eth.getBlock('latest')
+    sample_block_number = max(1, latest_block['number'] - sample_size)
+    num_blocks = latest_block['number'] - sample_block_number
+    if num_blocks < max(1, min_sample_size):
+        return None
+
+    sample_block = web3.eth.getBlock(sample_block_number)
+    return (latest_block['timestamp'] - sample_block['timestamp']) / float(num_blocks)
+
+
+def get_poll_interval(web3, sample_size=POLL_INTERVAL_SAMPLE_SIZE, min_sample_size=1):
+    """
+    Returns a polling interval of half the chain's average block time, bounded
+    by `MIN_POLL_INTERVAL` and `MAX_POLL_INTERVAL`.  Returns `None` when the
+    block time cannot be determined.
+    """
+    block_time = get_average_block_time(web3, sample_size, min_sample_size)
+    if block_time is None:
+        return None
+    return min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, block_time / 2))
+
+
+def is_transient_request_error(error):
+    """
+    Returns whether `error`, raised while making a request to the node, is a
+    transport failure or a response which could not be decoded.  These are
+    typical of overloaded or rate limiting public nodes and are worth
+    retrying, unlike the errors returned by the node itself which web3 raises
+    as a `ValueError` wrapping the JSON-RPC error object.
+    """
+    if isinstance(error, IOError):
+        return True
+    is_rpc_error = bool(error.args) and isinstance(error.args[0], dict)
+    return isinstance(error, JSONDecodeError) and not is_rpc_error
+
+
+def wait_for_transaction_receipt(web3, txn_hash, timeout=120, poll_interval=None,
+                                 max_retries=5, block_timeout=None):
+    """
+    Waits for the transaction `txn_hash` to be mined, returning its receipt.
+
+    In addition to the `timeout` in seconds, a `block_timeout` may be given in
+    which case a `ValueError` is raised as soon as the chain has advanced by
+    that many blocks without the transaction being mined, as happens when a
+    transaction has been dropped by the node.
+    """
+    retry_count = 0
+
+    if block_timeout is not None:
+        start_block = web3.eth.blockNumber
+
     with gevent.Timeout(timeout):
         while True:
-            txn_receipt = web3.eth.getTransactionReceipt(txn_hash)
+            try:
+                txn_receipt = web3.eth.getTransactionReceipt(txn_hash)
+            except (ValueError, IOError) as error:
+                # Public nodes rate limit clients which poll too aggressively,
+                # so back off exponentially before trying again.
+                if retry_count >= max_retries or not is_transient_request_error(error):
+                    raise
+                gevent.sleep((1 << retry_count) * 0.2)
+                retry_count += 1
+                continue
+            else:
+                retry_count = 0
+
             if txn_receipt is not None and txn_receipt['blockHash'] is not None:
                 break
+            if block_timeout is not None:
+                if web3.eth.blockNumber - start_block >= block_timeout:
+                    raise ValueError(
+                        "Transaction {0} was not mined within {1} blocks".format(
+                            txn_hash,
+                            block_timeout,
+                        )
+                    )
             if poll_interval is None:
                 gevent.sleep(random.random())
             else:
@@ -78,12 +168,15 @@ class Wait(object):
         if poll_interval is not empty:
             self.poll_interval = poll_interval
 
-    def for_contract_address(self, txn_hash, timeout=empty, poll_interval=empty):
+    def for_contract_address(self, txn_hash, timeout=empty, poll_interval=empty,
+                             block_timeout=empty):
         kwargs = {}
         if timeout is not empty:
             kwargs['timeout'] = timeout
         if poll_interval is not empty:
             kwargs['poll_interval'] = poll_interval
+        if block_timeout is not empty:
+            kwargs['block_timeout'] = block_timeout
 
         kwargs.setdefault('timeout', self.timeout)
         kwargs.setdefault('poll_interval', self.poll_interval)
@@ -91,13 +184,16 @@ class Wait(object):
         txn_receipt = self.for_receipt(txn_hash, **kwargs)
         return txn_receipt['contractAddress']
 
-    def for_receipt(self, txn_hash, timeout=empty, poll_interval=empty):
+    def for_receipt(self, txn_hash, timeout=empty, poll_interval=empty,
+                    block_timeout=empty):
         kwargs = {}
 
         if timeout is not empty:
             kwargs['timeout'] = timeout
         if poll_interval is not empty:
             kwargs['poll_interval'] = poll_interval
+        if block_timeout is not empty:
+            kwargs['block_timeout'] = block_timeout
 
         kwargs.setdefault('timeout', self.timeout)
         kwargs.setdefault('poll_interval', self.poll_interval)
@@ -28,8 +28,10 @@ setup(
         "configparser==3.5.0",
         "contextlib2>=0.5.4",
         "eth-testrpc>=0.8.0",
+        "ethereum-abi-utils>=0.2.1",
         "ethereum-tester-client>=1.1.0",
         "gevent>=1.1.2",
+        "geventhttpclient>=1.3.1",
         "py-geth>=1.1.0",
         "py-solc>=0.6.0",
         "pylru>=1.0.9",
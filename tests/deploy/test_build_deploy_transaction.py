@@ -0,0 +1,54 @@
+import pytest
+
+from populus.utils.deploy import (
+    build_deploy_transaction,
+)
+
+
+def test_build_deploy_transaction(web3, MATH):
+    MathFactory = web3.eth.contract(**MATH)
+    transaction = {'from': web3.eth.coinbase}
+
+    contract_factory, deploy_transaction = build_deploy_transaction(
+        web3,
+        MathFactory,
+        transaction,
+    )
+
+    assert contract_factory is MathFactory
+    assert deploy_transaction is transaction
+    assert deploy_transaction['from'] == web3.eth.coinbase
+    assert deploy_transaction['data'] == MathFactory.code
+
+
+def test_build_deploy_transaction_with_constructor_arguments(web3,
+                                                             WITH_CONSTRUCTOR_ARGUMENTS):
+    WithConstructorArgumentsFactory = web3.eth.contract(**WITH_CONSTRUCTOR_ARGUMENTS)
+
+    _, deploy_transaction = build_deploy_transaction(
+        web3,
+        WithConstructorArgumentsFactory,
+        {},
+        arguments=[1234, 'abcd'],
+    )
+
+    assert deploy_transaction['data'] == (
+        WithConstructorArgumentsFactory.code +
+        '{0:064x}'.format(1234) +
+        '61626364' + '00' * 28
+    )
+
+
+def test_build_deploy_transaction_requires_constructor_arguments(web3,
+                                                                 WITH_CONSTRUCTOR_ARGUMENTS):
+    WithConstructorArgumentsFactory = web3.eth.contract(**WITH_CONSTRUCTOR_ARGUMENTS)
+
+    with pytest.raises(ValueError):
+        build_deploy_transaction(web3, WithConstructorArgumentsFactory, {})
+
+
+def test_build_deploy_transaction_requires_code(web3, MATH):
+    AbiOnlyFactory = web3.eth.contract(abi=MATH['abi'])
+
+    with pytest.raises(ValueError):
+        build_deploy_transaction(web3, AbiOnlyFactory, {})
@@ -0,0 +1,12 @@
+from populus.migrations.registrar import (
+    get_compiled_registrar_contract,
+)
+
+
+def test_compiled_registrar_contract_is_cached():
+    first_contract_data = get_compiled_registrar_contract()
+    second_contract_data = get_compiled_registrar_contract()
+
+    assert first_contract_data is second_contract_data
+    assert first_contract_data['code']
+    assert first_contract_data['abi']
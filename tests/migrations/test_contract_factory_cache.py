@@ -0,0 +1,44 @@
+from populus.utils.contracts import (
+    get_contract_factory_from_compiled_contracts,
+)
+
+
+def test_contract_factories_are_reused_from_cache(web3, MATH):
+    cache = {}
+    compiled_contracts = {'Math': MATH}
+
+    first_factory = get_contract_factory_from_compiled_contracts(
+        web3, compiled_contracts, 'Math', cache=cache,
+    )
+    second_factory = get_contract_factory_from_compiled_contracts(
+        web3, compiled_contracts, 'Math', cache=cache,
+    )
+
+    assert first_factory is second_factory
+    assert first_factory.code == MATH['code']
+
+
+def test_contract_factories_not_reused_for_different_contract_data(web3, MATH):
+    cache = {}
+
+    first_factory = get_contract_factory_from_compiled_contracts(
+        web3, {'Math': MATH}, 'Math', cache=cache,
+    )
+    second_factory = get_contract_factory_from_compiled_contracts(
+        web3, {'Math': dict(MATH)}, 'Math', cache=cache,
+    )
+
+    assert first_factory is not second_factory
+
+
+def test_contract_factories_without_cache(web3, MATH):
+    compiled_contracts = {'Math': MATH}
+
+    first_factory = get_contract_factory_from_compiled_contracts(
+        web3, compiled_contracts, 'Math',
+    )
+    second_factory = get_contract_factory_from_compiled_contracts(
+        web3, compiled_contracts, 'Math',
+    )
+
+    assert first_factory is not second_factory
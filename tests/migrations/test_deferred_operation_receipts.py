@@ -0,0 +1,160 @@
+import gevent
+
+from populus.migrations import (
+    Migration,
+    SendTransaction,
+)
+from populus.migrations.batch import (
+    is_deferred_receipt,
+    resolve_deferred_receipts,
+)
+
+
+def test_is_deferred_receipt():
+    assert is_deferred_receipt({'receipt': gevent.spawn(lambda: None)}) is True
+    assert is_deferred_receipt({'transaction-hash': '0x1234'}) is False
+    assert is_deferred_receipt(None) is False
+
+
+def test_resolve_deferred_receipts():
+    operation_receipts = [
+        {'transaction-hash': '0x1234', 'receipt': gevent.spawn(lambda: {'blockNumber': 1})},
+        {'transaction-hash': '0x5678', 'receipt': gevent.spawn(lambda: {'blockNumber': 2})},
+    ]
+
+    assert resolve_deferred_receipts(operation_receipts) == ([
+        {'transaction-hash': '0x1234'},
+        {'transaction-hash': '0x5678'},
+    ], [None, None])
+
+
+def test_resolve_deferred_receipts_waits_for_all_receipts():
+    def fail():
+        raise ValueError("Transaction was not mined")
+
+    def succeed():
+        gevent.sleep(0.01)
+        return {'blockNumber': 2}
+
+    operation_receipts = [
+        {'transaction-hash': '0x1234', 'receipt': gevent.spawn(fail)},
+        {'transaction-hash': '0x5678', 'receipt': gevent.spawn(succeed)},
+    ]
+
+    resolved_operation_receipts, errors = resolve_deferred_receipts(operation_receipts)
+
+    assert resolved_operation_receipts == [None, {'transaction-hash': '0x5678'}]
+    assert errors[0] is not None
+    assert errors[1] is None
+
+
+def test_send_transaction_with_deferred_receipt(web3, chain):
+    operation = SendTransaction({
+        'from': web3.eth.coinbase,
+        'to': web3.eth.accounts[1],
+        'value': 12345,
+    }, timeout=30, defer_receipt=True)
+
+    operation_receipt = operation.execute(chain=chain)
+
+    txn_receipt = operation_receipt['receipt'].get()
+    assert txn_receipt['transactionHash'] == operation_receipt['transaction-hash']
+
+
+def test_migration_waits_for_deferred_receipts(web3, chain):
+    class TestMigration(Migration):
+        migration_id = '0001_initial'
+        dependencies = []
+
+        operations = [
+            SendTransaction({
+                'from': web3.eth.coinbase,
+                'to': web3.eth.accounts[1],
+                'value': 12345,
+            }, defer_receipt=True),
+        ]
+
+        compiled_contracts = {}
+
+    migration = TestMigration(chain)
+    migration.execute()
+
+    registrar = chain.registrar
+
+    assert registrar.call().getBool('migration/0001_initial/operation/0') is True
+    assert registrar.call().exists('migration/0001_initial/operation/0/transaction-hash')
+    assert registrar.call().getBool('migration/0001_initial') is True
+
+
+def get_processed_operation_keys(migration, monkeypatch):
+    processed_operation_keys = []
+    process_operation_receipt = migration.process_operation_receipt
+
+    def record_operation_receipt(operation_key, receipt):
+        processed_operation_keys.append(operation_key)
+        process_operation_receipt(operation_key, receipt)
+
+    monkeypatch.setattr(migration, 'process_operation_receipt', record_operation_receipt)
+    return processed_operation_keys
+
+
+def test_migration_waits_for_deferred_receipts_before_dependent_operations(web3,
+                                                                          chain,
+                                                                          monkeypatch):
+    class TestMigration(Migration):
+        migration_id = '0001_initial'
+        dependencies = []
+
+        operations = [
+            SendTransaction({
+                'from': web3.eth.coinbase,
+                'to': web3.eth.accounts[1],
+                'value': 12345,
+            }, defer_receipt=True),
+            SendTransaction({
+                'from': web3.eth.accounts[1],
+                'to': web3.eth.accounts[2],
+                'value': 1,
+            }),
+        ]
+
+        compiled_contracts = {}
+
+    migration = TestMigration(chain)
+    processed_operation_keys = get_processed_operation_keys(migration, monkeypatch)
+    migration.execute()
+
+    assert processed_operation_keys == [
+        'migration/0001_initial/operation/0',
+        'migration/0001_initial/operation/1',
+    ]
+
+
+def test_migration_defers_receipts_past_independent_operations(web3, chain, monkeypatch):
+    class TestMigration(Migration):
+        migration_id = '0001_initial'
+        dependencies = []
+
+        operations = [
+            SendTransaction({
+                'from': web3.eth.coinbase,
+                'to': web3.eth.accounts[1],
+                'value': 12345,
+            }, defer_receipt=True),
+            SendTransaction({
+                'from': web3.eth.accounts[2],
+                'to': web3.eth.accounts[3],
+                'value': 1,
+            }),
+        ]
+
+        compiled_contracts = {}
+
+    migration = TestMigration(chain)
+    processed_operation_keys = get_processed_operation_keys(migration, monkeypatch)
+    migration.execute()
+
+    assert processed_operation_keys == [
+        'migration/0001_initial/operation/1',
+        'migration/0001_initial/operation/0',
+    ]
@@ -0,0 +1,190 @@
+from populus.migrations import batch
+from populus.migrations.batch import (
+    fill_transaction_nonces,
+    send_transaction_batch,
+)
+
+
+SENDER_A = '0xd3cda913deb6f67967b99d67acdfa1712c293601'
+SENDER_B = '0x82a978b3f5962a5b0957d9ee9eef472ee55b42f1'
+
+START_NONCES = {
+    SENDER_A: 5,
+    SENDER_B: 9,
+}
+
+
+class FakeNode(object):
+    def __init__(self, supports_pending=True, supports_nonce=True, rejected_values=None):
+        self.supports_pending = supports_pending
+        self.supports_nonce = supports_nonce
+        self.rejected_values = rejected_values or set()
+        self.sent_transactions = []
+
+    def request(self, method, params):
+        if method == 'eth_getTransactionCount':
+            assert params[1] == 'pending'
+            if not self.supports_pending:
+                raise ValueError("Fetching 'pending' block is unsupported")
+            return hex(START_NONCES[params[0]])
+        elif method == 'eth_sendTransaction':
+            if 'nonce' in params[0] and not self.supports_nonce:
+                raise ValueError("Unexpected keyword argument 'nonce'")
+            if params[0].get('value') in self.rejected_values:
+                raise ValueError("Insufficient funds")
+            self.sent_transactions.append(params[0])
+            return '0x{0:064x}'.format(len(self.sent_transactions))
+        raise AssertionError("Unexpected request: {0}".format(method))
+
+    def make_batch_request(self, web3, requests, sequential=False):
+        return [self.request(method, params) for method, params in requests]
+
+    def make_batch_request_with_errors(self, web3, requests, sequential=False):
+        results = []
+        for method, params in requests:
+            try:
+                results.append((self.request(method, params), None))
+            except ValueError as error:
+                results.append((None, error))
+        return results
+
+
+class FakeEth(object):
+    defaultAccount = SENDER_A
+
+
+class FakeWeb3(object):
+    eth = FakeEth()
+
+
+def use_fake_node(monkeypatch, node):
+    monkeypatch.setattr(batch, 'make_batch_request', node.make_batch_request)
+    monkeypatch.setattr(
+        batch,
+        'make_batch_request_with_errors',
+        node.make_batch_request_with_errors,
+    )
+
+
+def test_fill_transaction_nonces(monkeypatch):
+    node = FakeNode()
+    use_fake_node(monkeypatch, node)
+
+    transactions = [
+        {'from': SENDER_A},
+        {'from': SENDER_B},
+        {'from': SENDER_A},
+        {'from': SENDER_B},
+    ]
+    fill_transaction_nonces(None, transactions)
+
+    assert [transaction['nonce'] for transaction in transactions] == [5, 9, 6, 10]
+
+
+def test_fill_transaction_nonces_skips_senders_with_one_transaction(monkeypatch):
+    node = FakeNode()
+    use_fake_node(monkeypatch, node)
+
+    transactions = [
+        {'from': SENDER_A},
+        {'from': SENDER_B},
+        {'from': SENDER_A},
+    ]
+    fill_transaction_nonces(None, transactions)
+
+    assert transactions[0]['nonce'] == 5
+    assert 'nonce' not in transactions[1]
+    assert transactions[2]['nonce'] == 6
+
+
+def test_fill_transaction_nonces_groups_senders_case_insensitively(monkeypatch):
+    node = FakeNode()
+    use_fake_node(monkeypatch, node)
+
+    transactions = [
+        {'from': SENDER_A},
+        {'from': '0x' + SENDER_A[2:].upper()},
+    ]
+    fill_transaction_nonces(None, transactions)
+
+    assert [transaction['nonce'] for transaction in transactions] == [5, 6]
+
+
+def test_fill_transaction_nonces_skips_senders_with_explicit_nonces(monkeypatch):
+    node = FakeNode()
+    use_fake_node(monkeypatch, node)
+
+    transactions = [
+        {'from': SENDER_A, 'nonce': 100},
+        {'from': SENDER_A},
+        {'from': SENDER_B},
+        {'from': SENDER_B},
+    ]
+    fill_transaction_nonces(None, transactions)
+
+    assert transactions[0]['nonce'] == 100
+    assert 'nonce' not in transactions[1]
+    assert transactions[2]['nonce'] == 9
+    assert transactions[3]['nonce'] == 10
+
+
+def test_fill_transaction_nonces_without_pending_block_support(monkeypatch):
+    node = FakeNode(supports_pending=False)
+    use_fake_node(monkeypatch, node)
+
+    transactions = [
+        {'from': SENDER_A},
+        {'from': SENDER_A},
+    ]
+    fill_transaction_nonces(None, transactions)
+
+    assert all('nonce' not in transaction for transaction in transactions)
+
+
+def test_send_transaction_batch_without_nonce_support(monkeypatch):
+    node = FakeNode(supports_nonce=False)
+    use_fake_node(monkeypatch, node)
+
+    transactions = [
+        {'from': SENDER_B, 'to': SENDER_A, 'gas': 21000},
+        {'from': SENDER_A, 'to': SENDER_B, 'gas': 21000},
+        {'from': SENDER_A, 'to': SENDER_B, 'gas': 21000, 'value': 1},
+    ]
+    transaction_hashes, errors = send_transaction_batch(FakeWeb3(), transactions)
+
+    assert len(set(transaction_hashes)) == 3
+    assert errors == [None, None, None]
+    assert all('nonce' not in transaction for transaction in node.sent_transactions)
+    assert [
+        transaction.get('value')
+        for transaction in node.sent_transactions
+        if transaction['from'] == SENDER_A
+    ] == [None, 1]
+
+
+def test_send_transaction_batch_stops_sending_after_a_sender_fails(monkeypatch):
+    node = FakeNode(rejected_values={2})
+    use_fake_node(monkeypatch, node)
+
+    transactions = [
+        {'from': SENDER_A, 'to': SENDER_B, 'gas': 21000, 'value': 1},
+        {'from': SENDER_A, 'to': SENDER_B, 'gas': 21000, 'value': 2},
+        {'from': SENDER_A, 'to': SENDER_B, 'gas': 21000, 'value': 3},
+        {'from': SENDER_B, 'to': SENDER_A, 'gas': 21000, 'value': 4},
+    ]
+    transaction_hashes, errors = send_transaction_batch(FakeWeb3(), transactions)
+
+    assert transaction_hashes[0] is not None
+    assert transaction_hashes[1] is None
+    assert transaction_hashes[2] is None
+    assert transaction_hashes[3] is not None
+
+    assert errors[0] is None
+    assert isinstance(errors[1], ValueError)
+    assert isinstance(errors[2], ValueError)
+    assert errors[3] is None
+
+    assert [
+        (transaction['value'], transaction.get('nonce'))
+        for transaction in node.sent_transactions
+    ] == [(1, 5), (4, None)]
@@ -0,0 +1,93 @@
+import pytest
+
+from web3.utils.abi import (
+    function_abi_to_4byte_selector,
+)
+
+from populus.utils.contracts import (
+    get_contract_function_abi,
+    get_contract_function_data,
+)
+
+
+OVERLOADED_ABI = [
+    {
+        'constant': False,
+        'inputs': [],
+        'name': 'increment',
+        'outputs': [{'name': '', 'type': 'uint256'}],
+        'type': 'function',
+    },
+    {
+        'constant': False,
+        'inputs': [{'name': 'amt', 'type': 'uint256'}],
+        'name': 'increment',
+        'outputs': [{'name': '', 'type': 'uint256'}],
+        'type': 'function',
+    },
+    {
+        'constant': False,
+        'inputs': [{'name': 'flag', 'type': 'bool'}],
+        'name': 'toggle',
+        'outputs': [],
+        'type': 'function',
+    },
+    {
+        'constant': False,
+        'inputs': [{'name': 'value', 'type': 'bytes32'}],
+        'name': 'toggle',
+        'outputs': [],
+        'type': 'function',
+    },
+]
+
+
+def test_function_abi_is_cached_by_name_and_argument_count(web3):
+    contract = web3.eth.contract(abi=OVERLOADED_ABI)
+    cache = {}
+
+    no_args_abi = get_contract_function_abi(contract, 'increment', [], cache=cache)
+    one_arg_abi = get_contract_function_abi(contract, 'increment', [3], cache=cache)
+
+    assert no_args_abi['inputs'] == []
+    assert len(one_arg_abi['inputs']) == 1
+    assert len(cache) == 2
+    assert get_contract_function_abi(contract, 'increment', [5], cache=cache) is one_arg_abi
+
+
+def test_overloads_with_same_argument_count_are_not_cached(web3):
+    contract = web3.eth.contract(abi=OVERLOADED_ABI)
+    cache = {}
+
+    bool_abi = get_contract_function_abi(contract, 'toggle', [True], cache=cache)
+    bytes_abi = get_contract_function_abi(contract, 'toggle', ['a' * 32], cache=cache)
+
+    assert bool_abi['inputs'][0]['type'] == 'bool'
+    assert bytes_abi['inputs'][0]['type'] == 'bytes32'
+    assert len(cache) == 0
+
+
+def test_function_data_matches_web3_encoding(web3):
+    contract = web3.eth.contract(abi=OVERLOADED_ABI)
+    cache = {}
+
+    function_data = get_contract_function_data(contract, 'increment', [3], cache=cache)
+    cached_function_data = get_contract_function_data(contract, 'increment', [3], cache=cache)
+
+    assert function_data == cached_function_data
+    function_abi = get_contract_function_abi(contract, 'increment', [3])
+    assert function_data == contract.encodeABI(
+        'increment',
+        [3],
+        data=function_abi_to_4byte_selector(function_abi),
+    )
+
+
+def test_function_abi_lookup_errors(web3):
+    contract = web3.eth.contract(abi=OVERLOADED_ABI)
+
+    with pytest.raises(ValueError):
+        get_contract_function_abi(contract, 'decrement', [])
+
+    with pytest.raises(ValueError):
+        get_contract_function_abi(contract, 'toggle', [12345])
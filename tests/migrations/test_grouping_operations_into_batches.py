@@ -0,0 +1,132 @@
+from populus.migrations import (
+    Address,
+    DeployContract,
+    RunPython,
+    SendTransaction,
+    TransactContract,
+)
+from populus.migrations.batch import (
+    group_operations_into_batches,
+)
+
+
+def get_batch_indices(operations, compiled_contracts):
+    operation_keys = [
+        'migration/0001_initial/operation/{0}'.format(index)
+        for index in range(len(operations))
+    ]
+    batches = group_operations_into_batches(
+        operations,
+        operation_keys,
+        compiled_contracts,
+    )
+    return [
+        [operation_index for operation_index, _ in batch]
+        for batch in batches
+    ]
+
+
+def test_independent_deployments_are_batched_together(MATH):
+    operations = [
+        DeployContract('Math'),
+        DeployContract('Math', contract_registrar_name='MathB'),
+    ]
+
+    assert get_batch_indices(operations, {'Math': MATH}) == [[0, 1]]
+
+
+def test_deployments_to_the_same_registrar_key_are_ordered(MATH):
+    operations = [
+        DeployContract('Math'),
+        DeployContract('Math'),
+    ]
+
+    assert get_batch_indices(operations, {'Math': MATH}) == [[0], [1]]
+
+
+def test_transaction_depends_on_deployment_it_references(MATH):
+    operations = [
+        DeployContract('Math'),
+        TransactContract(
+            contract_address=Address.defer(key='contract/Math'),
+            contract_name='Math',
+            method_name='increment',
+        ),
+        SendTransaction({'to': '0xd3cda913deb6f67967b99d67acdfa1712c293601'}),
+    ]
+
+    assert get_batch_indices(operations, {'Math': MATH}) == [[0, 2], [1]]
+
+
+def test_transactions_to_the_same_account_are_ordered(MATH):
+    operations = [
+        SendTransaction({'to': '0xd3cda913deb6f67967b99d67acdfa1712c293601'}),
+        SendTransaction({'to': '0xD3CDA913DEB6F67967B99D67ACDFA1712C293601'}),
+        SendTransaction({'to': '0x82a978b3f5962a5b0957d9ee9eef472ee55b42f1'}),
+    ]
+
+    assert get_batch_indices(operations, {}) == [[0, 2], [1]]
+
+
+def test_library_link_depends_on_library_deployment(LIBRARY_13, MULTIPLY_13):
+    operations = [
+        DeployContract('Library13'),
+        DeployContract('Multiply13'),
+    ]
+    compiled_contracts = {
+        'Library13': LIBRARY_13,
+        'Multiply13': MULTIPLY_13,
+    }
+
+    assert get_batch_indices(operations, compiled_contracts) == [[0], [1]]
+
+
+def test_unknown_operations_act_as_barriers(MATH):
+    operations = [
+        DeployContract('Math'),
+        RunPython(lambda **kwargs: {}),
+        DeployContract('Math', contract_registrar_name='MathB'),
+    ]
+
+    assert get_batch_indices(operations, {'Math': MATH}) == [[0], [1], [2]]
+
+
+def test_operations_passed_the_same_address_are_ordered(MATH):
+    operations = [
+        DeployContract('Math', contract_registrar_name='MathA'),
+        DeployContract('Math', arguments=['0xd3cda913deb6f67967b99d67acdfa1712c293601']),
+        TransactContract(
+            contract_address='0xD3CDA913DEB6F67967B99D67ACDFA1712C293601',
+            contract_name='Math',
+            method_name='increment',
+        ),
+        TransactContract(
+            contract_address='0x82a978b3f5962a5b0957d9ee9eef472ee55b42f1',
+            contract_name='Math',
+            method_name='add',
+            arguments=['d3cda913deb6f67967b99d67acdfa1712c293601', 3],
+        ),
+    ]
+
+    assert get_batch_indices(operations, {'Math': MATH}) == [[0, 1], [2], [3]]
+
+
+def test_spending_from_a_funded_account_is_ordered(MATH):
+    operations = [
+        SendTransaction({
+            'to': '0xd3cda913deb6f67967b99d67acdfa1712c293601',
+            'value': 1000000,
+        }),
+        DeployContract(
+            'Math',
+            transaction={'from': '0xD3CDA913DEB6F67967B99D67ACDFA1712C293601'},
+        ),
+        TransactContract(
+            contract_address='0x82a978b3f5962a5b0957d9ee9eef472ee55b42f1',
+            contract_name='Math',
+            method_name='increment',
+            transaction={'from': '0xd3cda913deb6f67967b99d67acdfa1712c293601'},
+        ),
+    ]
+
+    assert get_batch_indices(operations, {'Math': MATH}) == [[0], [1], [2]]
@@ -0,0 +1,157 @@
+import gevent
+import pytest
+
+from populus.migrations import (
+    Migration,
+    DeployContract,
+    Operation,
+    SendTransaction,
+    TransactContract,
+    TransactionOperation,
+)
+from populus.migrations.batch import (
+    execute_operation_batch,
+    run_operation_batch,
+    submit_operation_batch,
+)
+
+
+def test_execute_operation_batch(web3, chain, MATH):
+    operations = [
+        SendTransaction({
+            'from': web3.eth.coinbase,
+            'to': web3.eth.accounts[1],
+            'value': 12345,
+        }, timeout=30),
+        DeployContract('Math', timeout=30),
+    ]
+
+    initial_balance = web3.eth.getBalance(web3.eth.accounts[1])
+
+    send_receipt, deploy_receipt = execute_operation_batch(
+        operations,
+        chain=chain,
+        compiled_contracts={'Math': MATH},
+    )
+
+    after_balance = web3.eth.getBalance(web3.eth.accounts[1])
+
+    assert after_balance - initial_balance == 12345
+    assert 'transaction-hash' in send_receipt
+    assert 'canonical-contract-address' in deploy_receipt
+
+
+def test_migration_with_batched_operations(web3, chain, MATH):
+    class TestMigration(Migration):
+        migration_id = '0001_initial'
+        dependencies = []
+
+        operations = [
+            DeployContract('Math'),
+            DeployContract('Math', contract_registrar_name='MathB'),
+        ]
+
+        compiled_contracts = {
+            'Math': MATH,
+        }
+
+        def get_operation_batches(self):
+            return [list(enumerate(self.operations))]
+
+    migration = TestMigration(chain)
+    migration.execute()
+
+    registrar = chain.registrar
+
+    assert registrar.call().getBool('migration/0001_initial/operation/0') is True
+    assert registrar.call().getBool('migration/0001_initial/operation/1') is True
+
+    math_address = registrar.call().getAddress('contract/Math')
+    math_b_address = registrar.call().getAddress('contract/MathB')
+
+    assert math_address != math_b_address
+    assert web3.eth.getCode(math_address) == MATH['code_runtime']
+    assert web3.eth.getCode(math_b_address) == MATH['code_runtime']
+
+
+def test_execute_operation_batch_sends_transactions_in_order(web3, chain, math, MATH):
+    operations = [
+        TransactContract(
+            contract_name='Math',
+            method_name='increment',
+            arguments=[3],
+            contract_address=math.address,
+            timeout=30,
+        ),
+        TransactContract(
+            contract_name='Math',
+            method_name='increment',
+            arguments=[4],
+            contract_address=math.address,
+            timeout=30,
+        ),
+    ]
+
+    before_value = math.call().counter()
+
+    first_receipt, second_receipt = execute_operation_batch(
+        operations,
+        chain=chain,
+        compiled_contracts={'Math': MATH},
+    )
+
+    first_txn = web3.eth.getTransaction(first_receipt['transaction-hash'])
+    second_txn = web3.eth.getTransaction(second_receipt['transaction-hash'])
+
+    assert first_txn['nonce'] < second_txn['nonce']
+
+    after_value = math.call().counter()
+
+    assert after_value - before_value == 7
+
+
+def test_submit_operation_batch_submits_lone_transaction_directly():
+    class RecordingOperation(TransactionOperation):
+        def submit(self, prepared):
+            return prepared['transaction-hash']
+
+    submitted, errors = submit_operation_batch(
+        None,
+        [RecordingOperation()],
+        [{'transaction-hash': '0x1234'}],
+    )
+
+    assert submitted == ['0x1234']
+    assert errors == [None]
+
+
+def test_run_operation_batch_waits_for_every_receipt():
+    class WaitingOperation(Operation):
+        def __init__(self, receipt):
+            self.receipt = receipt
+
+        def execute(self, **kwargs):
+            return self.receipt
+
+        def await_receipt(self, prepared, submitted):
+            gevent.sleep(0.01)
+            if submitted is None:
+                raise ValueError("Transaction was not mined")
+            return submitted
+
+    class FakeChain(object):
+        web3 = None
+
+    operations = [
+        WaitingOperation(None),
+        WaitingOperation({'transaction-hash': '0x1234'}),
+    ]
+
+    operation_receipts, errors = run_operation_batch(operations, chain=FakeChain())
+
+    assert operation_receipts == [None, {'transaction-hash': '0x1234'}]
+    assert isinstance(errors[0], ValueError)
+    assert errors[1] is None
+
+    with pytest.raises(ValueError):
+        execute_operation_batch(operations, chain=FakeChain())
@@ -0,0 +1,48 @@
+import pytest
+
+from populus.migrations import (
+    SendTransaction,
+    DeployContract,
+    TransactContract,
+)
+
+
+@pytest.mark.parametrize(
+    'transaction',
+    (
+        {'data': '0x1234'},
+        {'to': '0xd3cda913deb6f67967b99d67acdfa1712c293601'},
+        {'data': '0x1234', 'to': '0xd3cda913deb6f67967b99d67acdfa1712c293601'},
+    ),
+)
+def test_deploy_contract_forbidden_transaction_keys(transaction):
+    with pytest.raises(ValueError):
+        DeployContract('Math', transaction=transaction)
+
+
+@pytest.mark.parametrize(
+    'transaction',
+    (
+        {'data': '0x1234'},
+        {'to': '0xd3cda913deb6f67967b99d67acdfa1712c293601'},
+    ),
+)
+def test_transact_contract_forbidden_transaction_keys(transaction):
+    with pytest.raises(ValueError):
+        TransactContract(
+            contract_address='0xd3cda913deb6f67967b99d67acdfa1712c293601',
+            contract_name='Math',
+            method_name='increment',
+            transaction=transaction,
+        )
+
+
+def test_allowed_transaction_keys():
+    DeployContract('Math', transaction={'from': '0xd3cda913deb6f67967b99d67acdfa1712c293601'})
+    TransactContract(
+        contract_address='0xd3cda913deb6f67967b99d67acdfa1712c293601',
+        contract_name='Math',
+        method_name='increment',
+        transaction={'value': 1},
+    )
+    SendTransaction({'to': '0xd3cda913deb6f67967b99d67acdfa1712c293601', 'data': '0x1234'})
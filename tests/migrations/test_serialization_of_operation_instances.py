@@ -39,6 +39,30 @@ from populus.migrations.writer import (
             key='contracts/Math',
         ),
     },
+)\n""",
+        ),
+        (
+            SendTransaction({}, poll_interval=2),
+            {'populus.migrations.operations'},
+            """populus.migrations.operations.SendTransaction(
+    poll_interval=2,
+    transaction={},
+)\n""",
+        ),
+        (
+            SendTransaction({}, defer_receipt=True),
+            {'populus.migrations.operations'},
+            """populus.migrations.operations.SendTransaction(
+    defer_receipt=True,
+    transaction={},
+)\n""",
+        ),
+        (
+            SendTransaction({}, block_timeout=50),
+            {'populus.migrations.operations'},
+            """populus.migrations.operations.SendTransaction(
+    block_timeout=50,
+    transaction={},
 )\n""",
         ),
         (
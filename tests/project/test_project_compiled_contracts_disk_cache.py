@@ -0,0 +1,43 @@
+import os
+
+from populus import compilation
+from populus.project import Project
+from populus.utils.filesystem import (
+    get_compiled_contracts_cache_dir,
+)
+
+
+def test_compiled_contracts_are_cached_on_disk(project_dir,
+                                               write_project_file,
+                                               monkeypatch,
+                                               MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+
+    compiled_contracts = Project().compiled_contracts
+    assert 'Math' in compiled_contracts
+
+    cache_dir = get_compiled_contracts_cache_dir(project_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    def compile_files(*args, **kwargs):
+        assert False, "Contracts should have been loaded from the cache"
+
+    monkeypatch.setattr(compilation, 'compile_files', compile_files)
+
+    assert Project().compiled_contracts == compiled_contracts
+
+
+def test_compiled_contracts_cache_misses_on_source_change(project_dir,
+                                                          write_project_file,
+                                                          MATH):
+    write_project_file('contracts/Math.sol', MATH['source'])
+    assert 'Math' in Project().compiled_contracts
+
+    write_project_file('contracts/Math.sol', MATH['source'].replace('Math', 'Maths'))
+    compiled_contracts = Project().compiled_contracts
+    assert 'Maths' in compiled_contracts
+    assert 'Math' not in compiled_contracts
+
+    # The cache file for the previous sources is removed.
+    cache_dir = get_compiled_contracts_cache_dir(project_dir)
+    assert len(os.listdir(cache_dir)) == 1
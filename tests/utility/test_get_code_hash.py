@@ -0,0 +1,25 @@
+import pytest
+
+from populus.utils.contracts import (
+    get_code_hash,
+    get_expected_code_hash,
+)
+
+
+@pytest.mark.parametrize(
+    'code_a,code_b,is_equal',
+    (
+        ('0x', '', True),
+        ('0x6060', '6060', True),
+        ('0xABCDEF', '0xabcdef', True),
+        ('0x6060', '0x6061', False),
+        ('0x6060', '0x606000', False),
+    ),
+)
+def test_get_code_hash(code_a, code_b, is_equal):
+    assert (get_code_hash(code_a) == get_code_hash(code_b)) is is_equal
+
+
+def test_get_expected_code_hash_matches_uncached_hash():
+    assert get_expected_code_hash('0x6060') == get_code_hash('0x6060')
+    assert get_expected_code_hash('0x6060') != get_code_hash('0x6061')
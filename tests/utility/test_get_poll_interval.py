@@ -0,0 +1,67 @@
+from populus.utils.wait import (
+    get_average_block_time,
+    get_poll_interval,
+    MIN_POLL_INTERVAL,
+    MAX_POLL_INTERVAL,
+    POLL_INTERVAL_SAMPLE_SIZE,
+)
+
+
+class FakeEth(object):
+    def __init__(self, timestamps):
+        self.timestamps = timestamps
+
+    def getBlock(self, block_identifier):
+        if block_identifier == 'latest':
+            block_identifier = len(self.timestamps) - 1
+        return {
+            'number': block_identifier,
+            'timestamp': self.timestamps[block_identifier],
+        }
+
+
+class FakeWeb3(object):
+    def __init__(self, timestamps):
+        self.eth = FakeEth(timestamps)
+
+
+def test_average_block_time_ignores_genesis_block():
+    web3 = FakeWeb3([0, 1000, 1001, 1002])
+
+    assert get_average_block_time(web3) == 1
+    assert get_poll_interval(web3) == 0.5
+
+
+def test_average_block_time_requires_two_blocks_after_genesis():
+    assert get_average_block_time(FakeWeb3([0])) is None
+    assert get_average_block_time(FakeWeb3([0, 1000])) is None
+    assert get_poll_interval(FakeWeb3([0, 1000])) is None
+
+
+def test_average_block_time_with_minimum_sample_size():
+    web3 = FakeWeb3([0, 1000, 1001, 1002])
+
+    assert get_average_block_time(web3, min_sample_size=3) is None
+    assert get_average_block_time(web3, min_sample_size=2) == 1
+
+
+def test_get_poll_interval_is_bounded(web3, chain):
+    chain.wait.for_block(web3.eth.blockNumber + 2, timeout=30)
+
+    poll_interval = get_poll_interval(web3)
+
+    assert MIN_POLL_INTERVAL <= poll_interval <= MAX_POLL_INTERVAL
+
+
+def test_chain_poll_interval_is_only_looked_up_once(web3, chain, monkeypatch):
+    chain.wait.for_block(POLL_INTERVAL_SAMPLE_SIZE + 1, timeout=30)
+
+    poll_interval = chain.get_poll_interval()
+    assert MIN_POLL_INTERVAL <= poll_interval <= MAX_POLL_INTERVAL
+
+    def getBlock(*args, **kwargs):
+        assert False, "The poll interval should have been reused"
+
+    monkeypatch.setattr(web3.eth, 'getBlock', getBlock)
+
+    assert chain.get_poll_interval() == poll_interval
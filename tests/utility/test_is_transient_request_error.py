@@ -0,0 +1,28 @@
+import json
+import socket
+
+import pytest
+
+from populus.utils.wait import (
+    is_transient_request_error,
+)
+
+
+def get_decode_error():
+    try:
+        json.loads('<html>429 Too Many Requests</html>')
+    except ValueError as error:
+        return error
+
+
+@pytest.mark.parametrize(
+    'error,expected',
+    (
+        (socket.error('Connection refused'), True),
+        (IOError('Connection reset'), True),
+        (get_decode_error(), True),
+        (ValueError({'code': -32000, 'message': 'unknown transaction'}), False),
+    ),
+)
+def test_is_transient_request_error(error, expected):
+    assert is_transient_request_error(error) is expected
@@ -0,0 +1,122 @@
+import pytest
+
+from web3.utils.encoding import (
+    to_decimal,
+)
+
+from populus.utils import rpc
+from populus.utils.rpc import (
+    make_batch_request,
+    make_batch_request_with_errors,
+    make_concurrent_requests,
+    make_http_batch_request,
+)
+
+
+def test_make_batch_request_returns_results_in_order(web3):
+    coinbase_balance, block_number, accounts = make_batch_request(web3, [
+        ('eth_getBalance', [web3.eth.coinbase, 'latest']),
+        ('eth_blockNumber', []),
+        ('eth_accounts', []),
+    ])
+
+    assert to_decimal(coinbase_balance) == web3.eth.getBalance(web3.eth.coinbase)
+    assert to_decimal(block_number) == web3.eth.blockNumber
+    assert accounts == web3.eth.accounts
+
+
+def test_make_batch_request_with_no_requests(web3):
+    assert make_batch_request(web3, []) == []
+
+
+def test_make_batch_request_raises_on_error(web3):
+    with pytest.raises(ValueError):
+        make_batch_request(web3, [
+            ('eth_blockNumber', []),
+            ('eth_not_a_real_method', []),
+        ])
+
+
+def test_make_batch_request_with_errors(web3):
+    (block_number, block_number_error), (result, error) = make_batch_request_with_errors(web3, [
+        ('eth_blockNumber', []),
+        ('eth_not_a_real_method', []),
+    ])
+
+    assert to_decimal(block_number) == web3.eth.blockNumber
+    assert block_number_error is None
+    assert result is None
+    assert isinstance(error, ValueError)
+
+
+def test_make_concurrent_requests_returns_results_in_order(web3):
+    block_number, accounts = make_concurrent_requests(web3, [
+        ('eth_blockNumber', []),
+        ('eth_accounts', []),
+    ])
+
+    assert to_decimal(block_number) == web3.eth.blockNumber
+    assert accounts == web3.eth.accounts
+
+
+class FakeProvider(object):
+    host = 'example.com'
+    port = 443
+    path = '/'
+    ssl = True
+    connection_timeout = 3
+    network_timeout = 7
+
+    def __init__(self):
+        self.request_counter = iter(range(10))
+
+
+def use_fake_http_client(monkeypatch, response_body):
+    client_kwargs = {}
+
+    class FakeResponse(object):
+        def read(self):
+            return response_body
+
+    class FakeHTTPClient(object):
+        def __init__(self, **kwargs):
+            client_kwargs.update(kwargs)
+
+        def post(self, path, body):
+            return FakeResponse()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(rpc, 'HTTPClient', FakeHTTPClient)
+    return client_kwargs
+
+
+def test_http_batch_request_uses_provider_connection_settings(monkeypatch):
+    client_kwargs = use_fake_http_client(
+        monkeypatch,
+        b'[{"jsonrpc": "2.0", "id": 0, "result": "0x1"}]',
+    )
+
+    responses = make_http_batch_request(FakeProvider(), [('eth_blockNumber', [])])
+
+    assert responses[0]['result'] == '0x1'
+    assert client_kwargs['ssl'] is True
+    assert client_kwargs['connection_timeout'] == 3
+    assert client_kwargs['network_timeout'] == 7
+
+
+def test_http_batch_request_with_unmatched_error_response(monkeypatch):
+    use_fake_http_client(
+        monkeypatch,
+        b'[{"jsonrpc": "2.0", "id": 0, "result": "0x1"}, '
+        b'{"jsonrpc": "2.0", "id": null, "error": {"code": -32600, "message": "Invalid"}}]',
+    )
+
+    responses = make_http_batch_request(FakeProvider(), [
+        ('eth_blockNumber', []),
+        ('eth_blockNumber', []),
+    ])
+
+    assert responses[0]['result'] == '0x1'
+    assert responses[1]['error'] == {'code': -32600, 'message': 'Invalid'}
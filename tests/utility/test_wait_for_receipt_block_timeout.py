@@ -0,0 +1,40 @@
+import gevent
+import pytest
+
+from populus.utils.wait import (
+    wait_for_transaction_receipt,
+)
+
+
+UNKNOWN_TXN_HASH = '0x' + '00' * 32
+
+
+def test_wait_for_receipt_raises_after_block_timeout(web3, chain):
+    def mine_blocks():
+        chain.wait.for_block(web3.eth.blockNumber + 3, timeout=30)
+
+    miner = gevent.spawn_later(0.1, mine_blocks)
+
+    try:
+        with pytest.raises(ValueError) as excinfo:
+            wait_for_transaction_receipt(
+                web3,
+                UNKNOWN_TXN_HASH,
+                timeout=30,
+                poll_interval=0.1,
+                block_timeout=2,
+            )
+    finally:
+        miner.kill()
+
+    assert 'was not mined within 2 blocks' in str(excinfo.value)
+
+
+def test_wait_for_receipt_with_block_timeout(web3, chain):
+    txn_hash = web3.eth.sendTransaction({
+        'to': web3.eth.coinbase,
+        'value': 1234,
+    })
+    txn_receipt = chain.wait.for_receipt(txn_hash, timeout=30, block_timeout=2)
+
+    assert txn_receipt['transactionHash'] == txn_hash